@@ -0,0 +1,57 @@
+"""
+Compares per-file pd.concat accumulation with a single combine of the Device page rows.
+
+Usage:
+    python benchmarks/bench_combine_device_data.py [--files 10 100 1000]
+
+Each synthetic file yields a few hundred device/test rows via extract_data.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest_module import concat_categorical, extract_data
+
+def synthetic_tuxconfig(index, jobs=4, builds=6, devices=8, tests=6):
+    return {'jobs': [{
+        'name': f'job-{j}',
+        'tests': [{'device': f'device-{(index + d) % 40}', 'tests': [f'test-{t}' for t in range(tests)]}
+                  for d in range(devices)],
+        'builds': [{
+            'build_name': f'build-{b}',
+            'targets': ['kernel', 'modules'],
+            'tests': [{'device': f'device-{(index + b) % 40}', 'tests': ['boot']}]
+        } for b in range(builds)]
+    } for j in range(jobs)]}
+
+def accumulate(frames):
+    """The previous loop: copies everything loaded so far on every file."""
+    all_data = pd.DataFrame()
+    for df in frames:
+        all_data = pd.concat([all_data, df])
+    return all_data
+
+def timed(combine, frames):
+    start = time.perf_counter()
+    result = combine(frames)
+    return time.perf_counter() - start, len(result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'rows':>9} {'accumulate':>12} {'combine once':>13}")
+    for count in args.files:
+        frames = [extract_data(synthetic_tuxconfig(i), f'config-{i}.yaml') for i in range(count)]
+        accumulate_time, rows = timed(accumulate, frames)
+        combine_time, _ = timed(concat_categorical, frames)
+        print(f"{count:>6} {rows:>9} {accumulate_time * 1000:>10.1f}ms {combine_time * 1000:>11.1f}ms")
+
+if __name__ == "__main__":
+    main()
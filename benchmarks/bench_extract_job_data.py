@@ -0,0 +1,97 @@
+"""
+Compares row-dict and normalized job extraction on a synthetic tuxconfig document.
+
+Usage:
+    python benchmarks/bench_extract_job_data.py [--rows N] [--repeat N]
+
+The document has enough jobs x builds x tests to produce about N rows
+(100,000 by default). Time is the best of --repeat runs; memory is the peak
+traced allocation of one run, including the DataFrames. "normalized" builds
+only the builds and job tests tables; "normalized + expand" also produces
+the full build x test view.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest_module import build_job_tables
+from model_module import build_job_model, expand_rows
+
+def extract_job_rows(data):
+    """The previous extractor: one dict per (build x test) row."""
+    job_data = []
+    for job in data.get('jobs', []):
+        job_name = job['name']
+        for build in job.get('builds', []):
+            build_name = build.get('build_name', 'Unnamed Build')
+            for test in job.get('tests', []):
+                device = test.get('device', 'Unknown')
+                test_names = test.get('tests', [])
+                if isinstance(test_names, list):
+                    for test_name in test_names:
+                        job_data.append({
+                            'job_name': job_name,
+                            'build_name': build_name,
+                            'test_name': test_name,
+                            'device': device,
+                            'target_arch': build.get('target_arch', 'Unknown'),
+                            'toolchain': build.get('toolchain', 'Unknown')
+                        })
+    return job_data
+
+def synthetic_tuxconfig(rows, jobs=10, builds=50, tests_per_device=10):
+    devices = max(1, rows // (jobs * builds * tests_per_device))
+    return {'jobs': [{
+        'name': f'job-{j}',
+        'builds': [{
+            'build_name': f'build-{j}-{b}',
+            'target_arch': ('arm64', 'x86_64', 'arm', 'riscv')[b % 4],
+            'toolchain': ('gcc-13', 'clang-17')[b % 2]
+        } for b in range(builds)],
+        'tests': [{
+            'device': f'device-{d}',
+            'tests': [f'test-{t}' for t in range(tests_per_device)]
+        } for d in range(devices)]
+    } for j in range(jobs)]}
+
+def measure(build_frame, data, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = build_frame(data)
+        best = min(best, time.perf_counter() - start)
+    del df
+    tracemalloc.start()
+    df = build_frame(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_tuxconfig(args.rows)
+    def normalized(d):
+        tables = build_job_tables(d)
+        return build_job_model([tables['builds']], [tables['tests']])
+
+    print(f"{len(expand_rows(normalized(data)))} rows")
+    for name, build_frame in (
+        ('row dicts', lambda d: pd.DataFrame(extract_job_rows(d))),
+        ('normalized', normalized),
+        ('normalized + expand', lambda d: expand_rows(normalized(d)))
+    ):
+        seconds, peak = measure(build_frame, data, args.repeat)
+        print(f"{name:20} {seconds * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB")
+
+if __name__ == "__main__":
+    main()
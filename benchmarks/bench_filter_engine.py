@@ -0,0 +1,98 @@
+"""
+Compares isin scans with the inverted index for the Main Dashboard sidebar filters.
+
+Usage:
+    python benchmarks/bench_filter_engine.py [--rows 100000 1000000 5000000]
+
+Each run builds a synthetic job model with about N build rows and N test rows,
+then times the five cascade option lists and the final filter for one
+selection per dimension, and the five cross-filtered option lists for the
+same selections.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_module import BUILD_DIMENSIONS, build_job_model, cross_filter_options, filter_job_model, option_values
+
+CASCADE = [('build_name', None), ('test_name', 'build_name'), ('job_name', 'test_name'),
+           ('target_arch', 'job_name'), ('device', 'target_arch')]
+
+def synthetic_tables(rows, jobs=20_000):
+    rng = np.random.default_rng(0)
+    def categorical(prefix, count, size):
+        return pd.Categorical.from_codes(rng.integers(0, count, size), [f'{prefix}-{i}' for i in range(count)])
+    builds = pd.DataFrame({
+        'job_id': np.sort(rng.integers(0, jobs, rows)),
+        'job_name': categorical('job', 500, rows),
+        'build_name': categorical('build', 2_000, rows),
+        'target_arch': categorical('arch', 12, rows),
+        'toolchain': categorical('toolchain', 8, rows)
+    })
+    tests = pd.DataFrame({
+        'job_id': np.sort(rng.integers(0, jobs, rows)),
+        'test_name': categorical('test', 300, rows),
+        'device': categorical('device', 60, rows)
+    })
+    return builds, tests
+
+def scan_option_values(model, column, filter_column=None, selected=None):
+    """The previous cascade step: one isin scan per level."""
+    builds, tests = model['builds'], model['tests']
+    table = builds if column in BUILD_DIMENSIONS else tests
+    if selected:
+        filter_table = builds if filter_column in BUILD_DIMENSIONS else tests
+        matches = filter_table[filter_table[filter_column].isin(selected)]
+        table = matches if filter_table is table else table[table['job_id'].isin(matches['job_id'])]
+    return list(table[column].unique())
+
+def scan_filter(model, selections):
+    """The previous final filter: one isin mask per column."""
+    builds, tests = model['builds'], model['tests']
+    build_mask = pd.Series(True, index=builds.index)
+    test_mask = pd.Series(True, index=tests.index)
+    for column, selected in selections.items():
+        if column in BUILD_DIMENSIONS:
+            build_mask &= builds[column].isin(selected)
+        else:
+            test_mask &= tests[column].isin(selected)
+    builds, tests = builds[build_mask], tests[test_mask]
+    job_ids = set(builds['job_id']).intersection(tests['job_id'])
+    return builds[builds['job_id'].isin(job_ids)], tests[tests['job_id'].isin(job_ids)]
+
+def timed(options, filter_rows, model):
+    selections = {}
+    start = time.perf_counter()
+    for column, filter_column in CASCADE:
+        values = options(model, column, filter_column, selections.get(filter_column))
+        selections[column] = values[:1]
+    filter_rows(model, selections)
+    return time.perf_counter() - start, selections
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'build index':>12} {'isin scans':>11} {'index':>9} {'cross-filter':>13}")
+    for rows in args.rows:
+        builds, tests = synthetic_tables(rows)
+        start = time.perf_counter()
+        model = build_job_model([builds], [tests])
+        index_time = time.perf_counter() - start
+        scan_time, _ = timed(scan_option_values, scan_filter, model)
+        indexed_time, selections = timed(option_values, filter_job_model, model)
+        start = time.perf_counter()
+        cross_filter_options(model, selections)
+        cross_time = time.perf_counter() - start
+        print(f"{rows:>9} {index_time * 1000:>10.1f}ms {scan_time * 1000:>9.1f}ms {indexed_time * 1000:>7.1f}ms"
+              f" {cross_time * 1000:>11.1f}ms")
+
+if __name__ == "__main__":
+    main()
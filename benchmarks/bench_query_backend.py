@@ -0,0 +1,48 @@
+"""
+Compares the pandas and DuckDB query backends on the Main Dashboard chart aggregates.
+
+Usage:
+    python benchmarks/bench_query_backend.py [--rows 100000 1000000 5000000]
+
+Each run builds a synthetic job model with about N build rows and N test
+rows (see bench_filter_engine.py) and times `count_rows` for the groupings
+of the heatmap, pie, bar and line charts with each backend.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import query_module
+from bench_filter_engine import synthetic_tables
+from model_module import build_job_model, count_rows
+
+CHART_GROUPINGS = [['job_name', 'target_arch', 'toolchain'], ['target_arch'], ['toolchain'], ['job_name']]
+
+def timed(model, backend):
+    query_module.QUERY_BACKEND = backend
+    start = time.perf_counter()
+    for columns in CHART_GROUPINGS:
+        count_rows(model, columns)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+    if query_module.duckdb is None:
+        sys.exit("duckdb is not installed")
+
+    print(f"{'rows':>9} {'pandas':>9} {'duckdb':>9}")
+    for rows in args.rows:
+        builds, tests = synthetic_tables(rows)
+        model = build_job_model([builds], [tests])
+        timed(model, 'duckdb')
+        pandas_time = timed(model, 'pandas')
+        duckdb_time = timed(model, 'duckdb')
+        print(f"{rows:>9} {pandas_time * 1000:>7.1f}ms {duckdb_time * 1000:>7.1f}ms")
+
+if __name__ == "__main__":
+    main()
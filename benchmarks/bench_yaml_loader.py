@@ -0,0 +1,121 @@
+"""
+Compares PyYAML's pure-Python SafeLoader with libyaml's CSafeLoader on tuxconfig files.
+
+Usage:
+    python benchmarks/bench_yaml_loader.py [SOURCE] [--repeat N]
+
+SOURCE defaults to TUXCONFIG_SOURCE and may be a directory index URL, a local
+directory or a file:// URL. The pruned event-stream parse used on row cache
+misses is timed too, after checking that it agrees with a full parse on
+every file and on the documents in EDGE_CASES. The pruned parse never
+constructs skipped subtrees, so it ignores construction errors there, such
+as unknown tags; IGNORED_ERROR_CASES pins that divergence down.
+"""
+import argparse
+import os
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest_module import (
+    DATA_SOURCE, EXTRACT_SCHEMA, cached_get, is_local_source, list_yaml_files, local_path, parse_pruned_yaml
+)
+
+EDGE_CASES = [
+    b"base: &b {build_name: b, target_arch: arm64}\njobs: [{name: j, builds: [{<<: *b, build_name: bb}]}]\n",
+    b"jobs: [{name: j, tests: [{device: &d juno, tests: [boot]}, {device: *d}]}]\n",
+    b"jobs: [{name: j, sets: [{kconfig: &k [a]}], builds: [{kconfig: *k, toolchain: gcc}]}]\n",
+    b"jobs: [{name: j, fragments: *missing}]\n",
+    b"jobs: [{name: j}]\n---\njobs: []\n",
+    b"",
+]
+
+IGNORED_ERROR_CASES = [
+    (b"jobs: []\nx: !custom foo\n", {'jobs': []}),
+    (b"jobs: [{name: j}]\nlogo: !!binary 'a'\n", {'jobs': [{'name': 'j'}]}),
+]
+
+def read_bytes(path):
+    if is_local_source(path):
+        with open(local_path(path), 'rb') as f:
+            return f.read()
+    content, _ = cached_get(path)
+    return content
+
+def prune(value, spec):
+    if isinstance(spec, dict) and isinstance(value, dict):
+        return {key: prune(item, spec[key]) for key, item in value.items() if key in spec}
+    if isinstance(spec, list) and isinstance(value, list):
+        return [prune(item, spec[0]) for item in value]
+    return value
+
+def outcome(parse, document):
+    try:
+        return parse(document)
+    except yaml.YAMLError as e:
+        return ('error', type(e).__name__)
+
+def check_pruned(documents):
+    """
+    Fails unless the pruned parse keeps what a full parse has at the `EXTRACT_SCHEMA` keys.
+
+    Errors must match too, except that a document the full parse rejects
+    with a ConstructorError may parse when the error lies in a skipped subtree.
+    """
+    for document, expected in IGNORED_ERROR_CASES:
+        full = outcome(yaml.safe_load, document)
+        pruned = outcome(parse_pruned_yaml, document)
+        if full != ('error', 'ConstructorError') or pruned != expected:
+            sys.exit(f"Unexpected outcome on {document!r}: {pruned!r} and {full!r} instead of {expected!r}")
+    for document in EDGE_CASES + documents:
+        full = outcome(lambda d: prune(yaml.safe_load(d), EXTRACT_SCHEMA), document)
+        pruned = outcome(lambda d: prune(parse_pruned_yaml(d), EXTRACT_SCHEMA), document)
+        if full == ('error', 'ConstructorError') and not isinstance(pruned, tuple):
+            print(f"Ignored a construction error in a skipped subtree of {document[:80]!r}")
+        elif full != pruned:
+            sys.exit(f"parse_pruned_yaml disagrees with yaml.safe_load on {document[:80]!r}:\n{pruned!r}\n{full!r}")
+
+def time_pruned(documents, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            parse_pruned_yaml(document)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def time_loader(documents, loader, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            yaml.load(document, Loader=loader)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('source', nargs='?', default=DATA_SOURCE)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    documents = [read_bytes(path) for path in list_yaml_files(args.source)]
+    total_mb = sum(len(document) for document in documents) / 1e6
+    print(f"{len(documents)} files, {total_mb:.1f} MB")
+    check_pruned(documents)
+
+    python_time = time_loader(documents, yaml.SafeLoader, args.repeat)
+    print(f"SafeLoader:  {python_time:8.3f} s")
+    pruned_time = time_pruned(documents, args.repeat)
+    print(f"Pruned:      {pruned_time:8.3f} s ({python_time / pruned_time:.1f}x faster)")
+    if not getattr(yaml, '__with_libyaml__', False):
+        print("CSafeLoader: unavailable (PyYAML built without libyaml)")
+        return
+    c_time = time_loader(documents, yaml.CSafeLoader, args.repeat)
+    print(f"CSafeLoader: {c_time:8.3f} s ({python_time / c_time:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
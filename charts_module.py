@@ -0,0 +1,197 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+from model_module import count_rows
+
+DEFAULT_COLOR_SCHEME = px.colors.qualitative.Plotly
+
+def create_arch_pie_chart(filtered_model):
+    """
+    Creates a pie chart showing the distribution of target architectures.
+
+    Args:
+        filtered_model (dict): The filtered job model.
+
+    Returns:
+        plotly.graph_objects.Figure: A Plotly pie chart figure.
+    """
+    arch_counts = count_rows(filtered_model, ['target_arch']).sort_values(ascending=False).reset_index()
+    arch_counts.columns = ['target_arch', 'count']
+    return px.pie(
+        arch_counts,
+        names='target_arch',
+        values='count',
+        title='Target Architecture Distribution',
+        hover_data={'count': True},
+        color_discrete_sequence=DEFAULT_COLOR_SCHEME
+    ).update_traces(
+        textinfo='percent+value',
+        hovertemplate="Architecture: %{label}<br>Count: %{value}<br>Percentage: %{percent}<extra></extra>"
+    )
+
+def create_toolchain_heatmap(filtered_model):
+    """
+    Creates a heatmap showing the relationship between toolchains, job names, and architectures.
+
+    Args:
+        filtered_model (dict): The filtered job model.
+
+    Returns:
+        plotly.graph_objects.Figure: A Plotly heatmap figure.
+    """
+    heatmap_data = count_rows(filtered_model, ['job_name', 'target_arch', 'toolchain']).reset_index(name='count')
+    heatmap_data['job_arch'] = heatmap_data['job_name'].astype(str) + ' (' + heatmap_data['target_arch'].astype(str) + ')'
+    heatmap_pivot = heatmap_data.pivot(index='job_arch', columns='toolchain', values='count').fillna(0)
+    return go.Figure(data=go.Heatmap(
+        z=heatmap_pivot.values,
+        x=heatmap_pivot.columns,
+        y=heatmap_pivot.index,
+        colorscale=[[0, 'white'], [1, 'red']],
+        text=heatmap_pivot.values,
+        texttemplate='%{text}',
+        textfont={"size": 12},
+        hoverongaps=False,
+        hovertemplate="Toolchain: %{x}<br>Job (Arch): %{y}<br>Count: %{z}<extra></extra>",
+        showscale=True,
+        xgap=3,
+        ygap=3
+    )).update_layout(
+        title='Toolchain vs Job Name and Architecture Heatmap',
+        height=1000,
+        width=1200,
+        xaxis_title='Toolchain',
+        yaxis_title='Job Name (Architecture)',
+        margin=dict(l=250, r=100, t=60, b=80),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(128, 128, 128, 0.2)',
+            tickangle=45,
+            showline=True,
+            linewidth=1,
+            linecolor='rgba(128, 128, 128, 0.2)',
+            mirror=True
+        ),
+        yaxis=dict(
+            autorange='reversed',
+            showgrid=True,
+            gridcolor='rgba(128, 128, 128, 0.2)',
+            showline=True,
+            linewidth=1,
+            linecolor='rgba(128, 128, 128, 0.2)',
+            mirror=True
+        ),
+        font=dict(size=14),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+
+def file_dimension(filtered_model):
+    """
+    Returns the file column as an extra chart dimension when several files are shown.
+
+    Args:
+        filtered_model (dict): The filtered job model.
+
+    Returns:
+        list: ['file'] if the model spans more than one file, else [].
+    """
+    builds = filtered_model['builds']
+    return ['file'] if 'file' in builds and builds['file'].nunique() > 1 else []
+
+def create_test_count_line_chart(filtered_model):
+    """
+    Creates a line chart showing the number of tests per job, with one line per file
+    when several files are selected.
+
+    Args:
+        filtered_model (dict): The filtered job model.
+
+    Returns:
+        plotly.graph_objects.Figure: A Plotly line chart figure.
+    """
+    by_file = file_dimension(filtered_model)
+    return px.line(
+        count_rows(filtered_model, by_file + ['job_name']).reset_index(name='test_count'),
+        x='job_name', y='test_count', title='Number of Tests per Job',
+        color=by_file[0] if by_file else None,
+        template='plotly_dark'
+    )
+
+def create_build_test_scatter(filtered_df):
+    """
+    Creates a scatter plot showing the relationship between builds and tests.
+
+    Args:
+        filtered_df (pd.DataFrame): The filtered DataFrame containing job data.
+
+    Returns:
+        plotly.graph_objects.Figure: A Plotly scatter plot figure.
+    """
+    scatter_fig = px.scatter(
+        filtered_df,
+        x='build_name',
+        y='test_name',
+        color='target_arch',
+        hover_data={
+            'job_name': True,
+            'toolchain': True,
+            'target_arch': True,
+            'test_count': True
+        },
+        title='Builds vs Tests',
+        height=1000,
+        width=1200,
+        template='plotly_dark'
+    ).update_traces(
+        marker=dict(size=10),
+        textposition='top center',
+        hovertemplate="<b>Build:</b> %{x}<br>" +
+                      "<b>Test:</b> %{y}<br>" +
+                      "<b>Job Name:</b> %{customdata[0]}<br>" +
+                      "<b>Toolchain:</b> %{customdata[1]}<br>" +
+                      "<b>Target Arch:</b> %{customdata[2]}<br>" +
+                      "<b>Test Count:</b> %{customdata[3]}<extra></extra>",
+    ).update_layout(
+        legend_title_text='Target Architecture',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    return scatter_fig
+
+def create_toolchain_bar_chart(filtered_model):
+    """
+    Creates a bar chart showing the distribution of toolchains, grouped by file
+    when several files are selected.
+
+    Args:
+        filtered_model (dict): The filtered job model.
+
+    Returns:
+        plotly.graph_objects.Figure: A Plotly bar chart figure.
+    """
+    by_file = file_dimension(filtered_model)
+    toolchain_counts = count_rows(filtered_model, by_file + ['toolchain']).sort_values(ascending=False).reset_index()
+    toolchain_counts.columns = by_file + ['toolchain', 'count']
+
+    return px.bar(
+        toolchain_counts,
+        x='toolchain',
+        y='count',
+        title='Toolchain Distribution',
+        labels={'toolchain': 'Toolchain', 'count': 'Number of Jobs', 'file': 'File'},
+        color=by_file[0] if by_file else 'toolchain',
+        barmode='group',
+        color_discrete_sequence=px.colors.qualitative.Safe,
+    ).update_layout(
+        xaxis={'categoryorder': 'total descending'},
+        yaxis_title='Number of Jobs',
+        xaxis_title='Toolchain',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
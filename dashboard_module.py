@@ -1,4 +1,5 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import json
 import plotly.io as pio
 import tempfile
@@ -19,6 +20,10 @@ def generate_filtered_dashboard(filtered_df, toolchain_heatmap, arch_pie, build_
     Returns:
         str: The file path to the generated HTML report.
     """
+    # The figures may be shared with the dashboard, so restyle copies.
+    toolchain_heatmap, arch_pie, build_test_scatter, test_count_line, toolchain_bar = (
+        go.Figure(fig) for fig in (toolchain_heatmap, arch_pie, build_test_scatter, test_count_line, toolchain_bar)
+    )
     toolchain_heatmap.update_layout(
         template='plotly',
         plot_bgcolor='white',
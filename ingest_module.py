@@ -0,0 +1,1283 @@
+import hashlib
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from html.parser import HTMLParser
+from io import BytesIO
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+DEFAULT_SOURCE = "https://people.linaro.org/~naresh.kamboju/lkft-common/tuxconfig/"
+DATA_SOURCE = os.environ.get("TUXCONFIG_SOURCE", DEFAULT_SOURCE)
+FETCH_WORKERS = int(os.environ.get("TUXCONFIG_FETCH_WORKERS", "8"))
+PARSE_PROCESSES = int(os.environ.get("TUXCONFIG_PARSE_PROCESSES", "0"))
+CACHE_DIR = os.environ.get("TUXCONFIG_CACHE_DIR", os.path.join(tempfile.gettempdir(), "tuxconfig-cache"))
+ROWS_CACHE_DIR = os.path.join(CACHE_DIR, "rows")
+CACHE_TTL = int(os.environ.get("TUXCONFIG_CACHE_TTL", "300"))
+REFRESH_INTERVAL = int(os.environ.get("TUXCONFIG_REFRESH_INTERVAL", "0"))
+JOB_EXTRACTOR_KEY = "job-tables-v5"
+DEVICE_EXTRACTOR_KEY = "device-rows-v4"
+JOB_COLUMNS = ('job_name', 'build_name', 'test_name', 'device', 'target_arch', 'toolchain')
+BUILD_COLUMNS = ('job_id', 'job_name', 'build_name', 'target_arch', 'toolchain')
+JOB_TEST_COLUMNS = ('job_id', 'test_name', 'device')
+DEVICE_COLUMNS = ('device', 'test', 'file', 'level')
+PROBLEM_COLUMNS = ('location', 'problem')
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+YAML_LOADER = YamlLoader.__name__
+
+_TEST_SCHEMA = [{'device': None, 'tests': None}]
+EXTRACT_SCHEMA = {
+    'jobs': [{
+        'name': None,
+        'tests': _TEST_SCHEMA,
+        'builds': [{
+            'build_name': None,
+            'target_arch': None,
+            'toolchain': None,
+            'targets': None,
+            'tests': _TEST_SCHEMA
+        }]
+    }]
+}
+
+logger = logging.getLogger(__name__)
+logger.info(f"Using YAML loader: {YAML_LOADER}")
+
+_session = None
+_session_lock = threading.Lock()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_tables_memo = {}
+_aggregates_memo = {}
+_store = {}
+_store_locks = {}
+_store_lock = threading.Lock()
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+_datasets = {}
+_refresh_threads = {}
+_refresh_lock = threading.Lock()
+_dataset_listeners = []
+
+def get_session():
+    """
+    Returns the process-wide HTTP session used for index listings and YAML downloads.
+
+    The session keeps connections alive between requests so that each file
+    does not pay for a new TCP and TLS handshake. The connection pool is
+    sized to the fetch concurrency so that no worker has to wait for, or
+    discard, a connection.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=max(1, FETCH_WORKERS),
+                    pool_block=True
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+                _session = session
+    return _session
+
+def get_process_pool():
+    """
+    Returns the process-wide pool that parses and extracts YAML files.
+
+    The pool has `PARSE_PROCESSES` workers (TUXCONFIG_PARSE_PROCESSES) and
+    uses the spawn start method, since the dashboard process runs threads.
+    A pool broken by a dying worker is replaced on the next call.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The shared pool.
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=PARSE_PROCESSES,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _process_pool
+
+def _reset_process_pool(pool):
+    """
+    Drops a broken process pool so that the next `get_process_pool` call starts a new one.
+
+    Args:
+        pool (concurrent.futures.ProcessPoolExecutor): The pool that broke;
+            nothing happens if it was already replaced.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+def parse_yaml(stream):
+    """
+    Parses a YAML document with the fastest available safe loader.
+
+    Uses libyaml's CSafeLoader when PyYAML was built with it and the
+    pure-Python SafeLoader otherwise. `YAML_LOADER` names the active loader.
+
+    Args:
+        stream (str, bytes or file-like): The YAML document.
+
+    Returns:
+        The parsed document.
+    """
+    return yaml.load(stream, Loader=YamlLoader)
+
+class _PruneFallback(Exception):
+    pass
+
+_resolver = yaml.resolver.Resolver()
+_constructor = yaml.constructor.SafeConstructor()
+
+_MERGE_TAG = 'tag:yaml.org,2002:merge'
+_SKIPPED = object()
+
+def _scalar_tag(event):
+    if event.tag is None or event.tag == '!':
+        return _resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    return event.tag
+
+def _construct_scalar(event):
+    tag = _scalar_tag(event)
+    node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+    construct = _constructor.yaml_constructors.get(tag, _constructor.yaml_constructors[None])
+    return construct(_constructor, node)
+
+def _skip_event(event, anchors):
+    # Skipped anchors are remembered so that aliases to them fall back to a
+    # full parse, and undefined aliases fail as they do with `parse_yaml`.
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise _PruneFallback(f"undefined alias *{event.anchor}")
+    elif event.anchor:
+        anchors[event.anchor] = _SKIPPED
+
+def _skip_node(events, event, anchors):
+    _skip_event(event, anchors)
+    if isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+        return
+    depth = 1
+    while depth:
+        event = next(events)
+        if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            _skip_event(event, anchors)
+            depth += 1
+        elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+            depth -= 1
+        else:
+            _skip_event(event, anchors)
+
+def _compose_pruned(events, event, spec, anchors):
+    if isinstance(event, yaml.AliasEvent):
+        if anchors.get(event.anchor, _SKIPPED) is _SKIPPED:
+            raise _PruneFallback(f"alias *{event.anchor} is undefined or points into a skipped subtree")
+        return anchors[event.anchor]
+
+    if isinstance(event, yaml.ScalarEvent):
+        value = _construct_scalar(event)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        item_spec = spec[0] if isinstance(spec, list) else None
+        value = []
+        for item_event in iter(lambda: next(events), None):
+            if isinstance(item_event, yaml.SequenceEndEvent):
+                break
+            value.append(_compose_pruned(events, item_event, item_spec, anchors))
+    elif isinstance(event, yaml.MappingStartEvent):
+        keep = spec if isinstance(spec, dict) else None
+        value = {}
+        for key_event in iter(lambda: next(events), None):
+            if isinstance(key_event, yaml.MappingEndEvent):
+                break
+            if isinstance(key_event, yaml.ScalarEvent) and _scalar_tag(key_event) == _MERGE_TAG:
+                raise _PruneFallback("merge keys are not supported")
+            key = _compose_pruned(events, key_event, None, anchors)
+            value_event = next(events)
+            if keep is not None and key not in keep:
+                _skip_node(events, value_event, anchors)
+                continue
+            try:
+                value[key] = _compose_pruned(events, value_event, keep[key] if keep else None, anchors)
+            except TypeError as e:
+                raise _PruneFallback(str(e))
+    else:
+        raise _PruneFallback(f"unexpected event {event}")
+
+    if event.anchor:
+        anchors[event.anchor] = value
+    return value
+
+def parse_pruned_yaml(stream, schema=None):
+    """
+    Parses only the parts of a YAML document that the extractors read.
+
+    Walks the parser's event stream and builds Python objects only for the
+    keys named in `schema`; every other subtree (kconfig fragments, build
+    parameters, ...) is skipped without constructing a node or object for
+    it. Documents the pruned walk cannot handle, such as aliases into
+    skipped subtrees, merge keys or values its constructor rejects, are
+    parsed in full with `parse_yaml`; so are streams that are not a single
+    document and undefined aliases, which `parse_yaml` then rejects.
+    Syntax errors are raised anywhere, but since skipped subtrees are never
+    constructed, construction errors inside them (unknown tags, invalid
+    !!binary data, ...) are ignored where `parse_yaml` would raise.
+
+    Args:
+        stream (str, bytes or file-like): The YAML document.
+        schema: Nested dicts naming the keys to keep; a one-element list
+            applies its spec to every sequence item and None keeps a whole
+            subtree. Defaults to `EXTRACT_SCHEMA`.
+
+    Returns:
+        The pruned document.
+    """
+    if schema is None:
+        schema = EXTRACT_SCHEMA
+    try:
+        events = iter(yaml.parse(stream, Loader=YamlLoader))
+        document = None
+        documents = 0
+        for event in events:
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                if documents > 1:
+                    raise _PruneFallback("the stream holds several documents")
+                document = _compose_pruned(events, next(events), schema, {})
+        return document
+    except (_PruneFallback, yaml.constructor.ConstructorError) as e:
+        logger.info(f"Falling back to a full YAML parse: {e}")
+        if hasattr(stream, 'seek'):
+            stream.seek(0)
+        return parse_yaml(stream)
+
+def _cache_paths(url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, key + '.body'), os.path.join(CACHE_DIR, key + '.json')
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def cached_get(url):
+    """
+    Fetches a URL through the on-disk HTTP cache.
+
+    Stored responses are revalidated with a conditional GET using their
+    ETag and Last-Modified validators. A 304 reply reuses the stored body.
+
+    Args:
+        url (str): The URL to fetch.
+
+    Returns:
+        tuple: The response body as bytes and the SHA-256 digest of the body.
+
+    Raises:
+        requests.HTTPError: If the server returns an error status.
+    """
+    body_path, meta_path = _cache_paths(url)
+    meta = None
+    if os.path.exists(body_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+
+    headers = {}
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = get_session().get(url, headers=headers)
+    if response.status_code == 304 and meta:
+        with open(body_path, 'rb') as f:
+            return f.read(), meta['digest']
+    response.raise_for_status()
+
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_atomic(body_path, content)
+        _write_atomic(meta_path, json.dumps({
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'digest': digest
+        }).encode('utf-8'))
+    return content, digest
+
+def is_local_source(source):
+    """
+    Checks whether a data source refers to the local filesystem.
+
+    Args:
+        source (str): A URL, a file:// URL or a filesystem path.
+
+    Returns:
+        bool: True for file:// URLs and plain paths, False for http(s) URLs.
+    """
+    return not source.startswith(('http://', 'https://'))
+
+def local_path(source):
+    """
+    Converts a file:// URL to a filesystem path. Plain paths are returned unchanged.
+
+    Args:
+        source (str): A file:// URL or a filesystem path.
+
+    Returns:
+        str: The filesystem path.
+    """
+    if source.startswith('file://'):
+        return url2pathname(urlparse(source).path)
+    return os.path.expanduser(source)
+
+def list_local_yaml_entries(source):
+    """
+    Lists the YAML files in a local directory.
+
+    Args:
+        source (str): A directory path or file:// URL.
+
+    Returns:
+        list: Dicts with the 'path', 'size' (bytes) and 'modified' (datetime)
+            of each .yml/.yaml file, sorted by path.
+    """
+    yaml_entries = []
+    with os.scandir(local_path(source)) as entries:
+        for entry in entries:
+            if entry.name.endswith(('.yml', '.yaml')) and entry.is_file():
+                stat = entry.stat()
+                yaml_entries.append({
+                    'path': entry.path,
+                    'size': stat.st_size,
+                    'modified': datetime.fromtimestamp(stat.st_mtime)
+                })
+    return sorted(yaml_entries, key=lambda entry: entry['path'])
+
+_MODIFIED_RE = re.compile(r'(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?|\d{2}-[A-Z][a-z]{2}-\d{4} \d{2}:\d{2})')
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)([KMGT]?)$')
+_MODIFIED_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S', '%d-%b-%Y %H:%M')
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def _parse_listing_columns(text):
+    modified = None
+    size = None
+    match = _MODIFIED_RE.search(text)
+    if match:
+        for fmt in _MODIFIED_FORMATS:
+            try:
+                modified = datetime.strptime(match.group(1), fmt)
+                break
+            except ValueError:
+                pass
+        text = text[match.end():]
+    for token in text.split():
+        size_match = _SIZE_RE.match(token)
+        if size_match:
+            size = int(float(size_match.group(1)) * _SIZE_UNITS[size_match.group(2)])
+            break
+    return modified, size
+
+class _IndexParser(HTMLParser):
+    """
+    Collects the .yml/.yaml links of an Apache-style directory index.
+
+    Only matching anchors are kept. The text following each of them up to
+    the next link or table row is read for the modified-time and size columns.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.entries = []
+        self._current = None
+        self._in_anchor = False
+        self._columns = []
+
+    def _finish_entry(self):
+        if self._current is not None:
+            self._current['modified'], self._current['size'] = _parse_listing_columns(' '.join(self._columns))
+            self.entries.append(self._current)
+            self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self._finish_entry()
+            href = dict(attrs).get('href')
+            if href and href.endswith(('.yml', '.yaml')):
+                self._current = {'href': href}
+                self._in_anchor = True
+                self._columns = []
+        elif tag in ('tr', 'li'):
+            self._finish_entry()
+
+    def handle_endtag(self, tag):
+        if tag == 'a':
+            self._in_anchor = False
+        elif tag in ('tr', 'li', 'pre', 'table'):
+            self._finish_entry()
+
+    def handle_data(self, data):
+        if self._current is not None and not self._in_anchor:
+            self._columns.append(data)
+
+    def close(self):
+        super().close()
+        self._finish_entry()
+
+def parse_index_html(content, base_url):
+    """
+    Extracts the YAML file links from a directory index page.
+
+    Args:
+        content (bytes or str): The HTML of the index page.
+        base_url (str): The URL the page was fetched from.
+
+    Returns:
+        list: Dicts with the absolute 'path' of each YAML file and the 'size'
+            (bytes) and 'modified' (datetime) listing columns, or None where
+            the listing does not show them.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    parser = _IndexParser()
+    parser.feed(content)
+    parser.close()
+    return [
+        {'path': urljoin(base_url, entry['href']), 'size': entry['size'], 'modified': entry['modified']}
+        for entry in parser.entries
+    ]
+
+def _rows_cache_path(digest, extractor_key):
+    key = hashlib.sha256(f"{extractor_key}\0{digest}".encode('utf-8')).hexdigest()
+    return os.path.join(ROWS_CACHE_DIR, key + '.parquet')
+
+def _parse_and_extract(content, extract_functions):
+    document = parse_pruned_yaml(content)
+    return {names: extract(document) for names, extract in extract_functions.items()}
+
+def _table_keys(names, extractor_key):
+    if isinstance(names, tuple):
+        return [(name, f"{extractor_key}:{name}") for name in names]
+    return [(names, extractor_key)]
+
+def _read_cached_table(digest, extractor_key):
+    cache_path = _rows_cache_path(digest, extractor_key)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable row cache {cache_path}: {e}")
+        return None
+
+def _write_cached_table(digest, extractor_key, df):
+    try:
+        buffer = BytesIO()
+        df.to_parquet(buffer, index=False)
+        os.makedirs(ROWS_CACHE_DIR, exist_ok=True)
+        _write_atomic(_rows_cache_path(digest, extractor_key), buffer.getvalue())
+    except Exception as e:
+        logger.warning(f"Could not cache extracted rows: {e}")
+
+def _extract_tables(content, digest, extractors):
+    tables = {}
+    missing = {}
+    for names, (extractor_key, extract) in extractors.items():
+        for name, table_key in _table_keys(names, extractor_key):
+            tables[name] = _read_cached_table(digest, table_key)
+            if tables[name] is None:
+                missing[names] = (extractor_key, extract)
+
+    if missing:
+        extract_functions = {names: extract for names, (_, extract) in missing.items()}
+        extracted = None
+        if PARSE_PROCESSES > 0:
+            pool = get_process_pool()
+            try:
+                extracted = pool.submit(_parse_and_extract, bytes(content), extract_functions).result()
+            except BrokenProcessPool as e:
+                # A worker died, e.g. out of memory on a large file: replace
+                # the pool for later files and parse this one here.
+                logger.warning(f"Parse process pool broke, parsing in-process: {e}")
+                _reset_process_pool(pool)
+        if extracted is None:
+            extracted = _parse_and_extract(content, extract_functions)
+        for names, (extractor_key, _) in missing.items():
+            result = extracted[names] if isinstance(names, tuple) else {names: extracted[names]}
+            for name, table_key in _table_keys(names, extractor_key):
+                df = result[name]
+                if df is not None:
+                    _write_cached_table(digest, table_key, df)
+                tables[name] = df
+    return {name: encode_shared(df) for name, df in tables.items()}
+
+def load_tables(path, extractors):
+    """
+    Loads the tables extracted from a YAML file through the columnar row cache.
+
+    Extracted tables are stored as Parquet files keyed by the SHA-256 of the
+    raw YAML bytes and the extractor key. When a file's bytes are unchanged
+    the tables are read back directly, skipping both YAML parsing and
+    extraction. Otherwise the file is parsed once, keeping only the
+    `EXTRACT_SCHEMA` parts, and every missing table is extracted from it.
+    The tables of the last version seen of each file are also kept in
+    memory, so an unchanged file costs only a revalidation. With
+    `PARSE_PROCESSES` set, parsing and extraction run in a worker process
+    and only the extracted tables are sent back.
+
+    Args:
+        path (str): An http(s) URL, a file:// URL or a filesystem path.
+        extractors (dict): Maps table names to (extractor_key, extract) pairs.
+            `extract` turns parsed YAML data into a DataFrame, or None if the
+            data is unusable; None results are not cached. A tuple of table
+            names maps to an `extract` returning a dict of those tables from
+            one walk of the document; each is cached under
+            "extractor_key:name". `extract` must be
+            picklable (a module-level function or a partial of one) so that
+            it can run in the parse process pool. `extractor_key`
+            identifies the extractor and its version and must change
+            whenever the extractor's output changes.
+
+    Returns:
+        tuple: The SHA-256 of the file's bytes and a dict mapping table
+            names to DataFrames (or None).
+    """
+    memo_key = (path, tuple(sorted(key for key, _ in extractors.values())))
+
+    def extract(content, digest):
+        memo = _tables_memo.get(memo_key)
+        if memo and memo[0] == digest:
+            return memo
+        memo = _tables_memo[memo_key] = (digest, _extract_tables(content, digest, extractors))
+        return memo
+
+    if not is_local_source(path):
+        return extract(*cached_get(path))
+
+    with open(local_path(path), 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return extract(b'', hashlib.sha256(b'').hexdigest())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return extract(buffer, hashlib.sha256(buffer).hexdigest())
+
+def _cached(key, load, refresh=False):
+    with _store_lock:
+        key_lock = _store_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        entry = _store.get(key)
+        if entry and not refresh and time.monotonic() - entry[0] < CACHE_TTL:
+            return entry[1]
+        value = load()
+        _store[key] = (time.monotonic(), value)
+        return value
+
+def validate_yaml_data(data):
+    """
+    Validates the top-level structure of the parsed YAML data.
+
+    Args:
+        data (dict): The parsed YAML data.
+
+    Returns:
+        str: A description of the problem, or None if the data is valid.
+    """
+    if not data:
+        return "document is empty"
+    if not isinstance(data, dict):
+        return f"document is a {type(data).__name__}, expected a mapping"
+    if 'jobs' not in data:
+        return "'jobs' key not found"
+    if not isinstance(data['jobs'], list):
+        return f"'jobs' is a {type(data['jobs']).__name__}, expected a list"
+    return None
+
+def _entry_list(entry, key, location, problems):
+    values = entry.get(key, [])
+    if values is None:
+        return []
+    if not isinstance(values, list):
+        problems.append((f"{location}.{key}", f"expected a list, got {type(values).__name__}"))
+        return []
+    return values
+
+def _dimension_value(value):
+    # YAML scalars such as 1, 1.0 and yes are equal in pandas; as strings
+    # they stay distinct categories and serialize to Parquet.
+    return value if value is None or isinstance(value, str) else str(value)
+
+def _job_tests(job, location, problems):
+    devices = []
+    test_names = []
+    for index, test in enumerate(_entry_list(job, 'tests', location, problems)):
+        test_location = f"{location}.tests[{index}]"
+        if not isinstance(test, dict):
+            problems.append((test_location, f"expected a mapping, got {type(test).__name__}"))
+            continue
+        names = _entry_list(test, 'tests', test_location, problems)
+        devices.extend([_dimension_value(test.get('device', 'Unknown'))] * len(names))
+        test_names.extend(_dimension_value(name) for name in names)
+    return devices, test_names
+
+def extract_job_data(data):
+    """
+    Validates the parsed YAML data and extracts job, build, and test information in one pass.
+
+    Builds and test assignments are kept in separate tables linked by the
+    job's position in the file (job_id) instead of pairing every build of a
+    job with every test of that job. Jobs without builds or without tests
+    are left out, as they produce no build/test pairs.
+
+    Malformed entries do not abort the extraction: a job without a name or
+    an entry of the wrong type is skipped and reported in 'problems' with
+    its location (e.g. "jobs[3].builds[1]"), and the rest of the file is
+    still extracted. Dimension values that are not strings (numbers,
+    booleans) are converted to strings, like the Device page test names.
+
+    Args:
+        data (dict): The parsed YAML data containing job information.
+
+    Returns:
+        dict: 'builds' maps the columns job_id, job_name, build_name,
+            target_arch and toolchain to lists of values, and 'tests' maps
+            job_id, test_name and device to lists of values; both are None
+            if the document itself is invalid. 'problems' maps location and
+            problem to lists of values.
+    """
+    problems = []
+    document_problem = validate_yaml_data(data)
+    if document_problem:
+        return {'builds': None, 'tests': None, 'problems': {'location': ['document'], 'problem': [document_problem]}}
+
+    builds = {name: [] for name in BUILD_COLUMNS}
+    tests = {name: [] for name in JOB_TEST_COLUMNS}
+    for job_id, job in enumerate(data['jobs']):
+        location = f"jobs[{job_id}]"
+        if not isinstance(job, dict):
+            problems.append((location, f"expected a mapping, got {type(job).__name__}"))
+            continue
+        if job.get('name') is None:
+            problems.append((location, "job has no 'name'"))
+            continue
+        job_name = _dimension_value(job['name'])
+        devices, test_names = _job_tests(job, location, problems)
+        job_builds = []
+        for index, build in enumerate(_entry_list(job, 'builds', location, problems)):
+            if not isinstance(build, dict):
+                problems.append((f"{location}.builds[{index}]", f"expected a mapping, got {type(build).__name__}"))
+                continue
+            job_builds.append(build)
+        if not test_names or not job_builds:
+            continue
+        tests['job_id'].extend([job_id] * len(test_names))
+        tests['test_name'].extend(test_names)
+        tests['device'].extend(devices)
+        for build in job_builds:
+            builds['job_id'].append(job_id)
+            builds['job_name'].append(job_name)
+            builds['build_name'].append(_dimension_value(build.get('build_name', 'Unnamed Build')))
+            builds['target_arch'].append(_dimension_value(build.get('target_arch', 'Unknown')))
+            builds['toolchain'].append(_dimension_value(build.get('toolchain', 'Unknown')))
+    problem_columns = [list(values) for values in zip(*problems)] or [[] for _ in PROBLEM_COLUMNS]
+    return {'builds': builds, 'tests': tests, 'problems': dict(zip(PROBLEM_COLUMNS, problem_columns))}
+
+def build_job_tables(data):
+    """
+    Converts parsed YAML data to the builds, job tests and problems tables.
+
+    Args:
+        data (dict): The parsed YAML data.
+
+    Returns:
+        dict: 'builds' and 'tests' DataFrames with categorical dimension
+            columns (None if the document is invalid) and a 'problems'
+            DataFrame listing what `extract_job_data` skipped.
+    """
+    extracted = extract_job_data(data)
+    tables = {'problems': pd.DataFrame(extracted.pop('problems'), columns=list(PROBLEM_COLUMNS))}
+    for name, columns in extracted.items():
+        tables[name] = None if columns is None else pd.DataFrame(columns).astype({
+            column: 'category' for column in columns if column != 'job_id'
+        })
+    return tables
+
+def _mappings(entry, key):
+    values = entry.get(key)
+    return [value for value in values if isinstance(value, dict)] if isinstance(values, list) else []
+
+def _collect_device_tests(test_entries, devices, tests):
+    seen_devices = {}
+    for test in test_entries:
+        device = test.get('device', 'unspecified')
+        if device == 'unspecified':
+            continue
+        seen_devices[device] = None
+        test_names = test.get('tests', [])
+        if not isinstance(test_names, list):
+            test_names = [test_names]
+        test_names = [str(test_name) for test_name in test_names if test_name is not None]
+        devices.extend([device] * len(test_names))
+        tests.extend(test_names)
+    return list(seen_devices)
+
+def extract_data(yaml_data, file_name):
+    """
+    Extracts device and test information from YAML data.
+
+    Malformed entries (see `extract_job_data`) are skipped. Rows are
+    collected per level into column chunks. For builds with
+    targets, the devices seen while collecting the build's tests are
+    cross-joined with the targets using numpy repeat/tile instead of a
+    nested loop.
+
+    Args:
+        yaml_data (dict): The parsed YAML data.
+        file_name (str): The name of the YAML file.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing device and test information,
+            with categorical columns.
+    """
+    device_chunks = []
+    test_chunks = []
+    levels = []
+
+    def add_chunk(devices, tests, level):
+        if len(devices):
+            device_chunks.append(np.asarray(devices, dtype=object))
+            test_chunks.append(np.asarray(tests, dtype=object))
+            levels.append((level, len(devices)))
+
+    for job in _mappings(yaml_data, 'jobs'):
+        devices, tests = [], []
+        _collect_device_tests(_mappings(job, 'tests'), devices, tests)
+        add_chunk(devices, tests, 'job')
+
+        for build in _mappings(job, 'builds'):
+            devices, tests = [], []
+            build_devices = _collect_device_tests(_mappings(build, 'tests'), devices, tests)
+            add_chunk(devices, tests, 'build')
+
+            targets = build.get('targets')
+            if targets and isinstance(targets, list) and build_devices:
+                target_names = np.array([str(target) for target in targets], dtype=object)
+                device_names = np.array(build_devices, dtype=object)
+                add_chunk(
+                    np.tile(device_names, len(target_names)),
+                    np.repeat(target_names, len(device_names)),
+                    'target'
+                )
+
+    if not device_chunks:
+        return pd.DataFrame(columns=list(DEVICE_COLUMNS)).astype('category')
+    level_names, level_counts = zip(*levels)
+    row_count = sum(level_counts)
+    return pd.DataFrame({
+        'device': pd.Categorical(np.concatenate(device_chunks)),
+        'test': pd.Categorical(np.concatenate(test_chunks)),
+        'file': pd.Categorical([file_name] * row_count),
+        'level': pd.Categorical(np.repeat(np.array(level_names, dtype=object), level_counts))
+    })
+
+class _ColumnDictionary:
+    """
+    Append-only dictionary of the values of one column, shared by all files.
+
+    Codes never change once assigned, so the categories of a table encoded
+    earlier are always a prefix of the current categories. Values are keyed
+    by equality, as pandas requires of categories, so 1, 1.0 and True share
+    the code of whichever was seen first.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._values = []
+        self._categories = pd.Index([], dtype=object)
+        self._lock = threading.Lock()
+
+    def encode(self, values):
+        with self._lock:
+            codes = np.empty(len(values), dtype=np.int64)
+            for position, value in enumerate(values):
+                code = self._codes.get(value)
+                if code is None:
+                    code = self._codes[value] = len(self._values)
+                    self._values.append(value)
+                codes[position] = code
+            if len(self._categories) != len(self._values):
+                self._categories = pd.Index(self._values, dtype=object)
+            return codes, self._categories
+
+def encode_shared(df):
+    """
+    Re-encodes the categorical columns of a table against the process-wide column dictionaries.
+
+    Every file's table then refers to the same category values, each held
+    once per process, and its codes index one dictionary per column name.
+    Tables encoded this way are concatenated by `concat_categorical` without
+    re-hashing their values.
+
+    Args:
+        df (pd.DataFrame): A table with categorical columns, or None.
+
+    Returns:
+        pd.DataFrame: The same rows with shared categories, or None.
+    """
+    if df is None:
+        return None
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            with _dictionaries_lock:
+                dictionary = _dictionaries.setdefault(name, _ColumnDictionary())
+            mapping, categories = dictionary.encode(list(column.cat.categories))
+            codes = column.cat.codes.to_numpy()
+            shared_codes = np.full(len(codes), -1, dtype=np.int64)
+            present = codes >= 0
+            shared_codes[present] = mapping[codes[present]]
+            column = pd.Categorical.from_codes(shared_codes, dtype=pd.CategoricalDtype(categories))
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
+
+def _shared_categories(parts):
+    categories = max((part.cat.categories for part in parts), key=len)
+    for part in parts:
+        part_categories = part.cat.categories
+        if part_categories is not categories and not (
+            len(part_categories) <= len(categories)
+            and part_categories.equals(categories[:len(part_categories)])
+        ):
+            return None
+    return categories
+
+def concat_categorical(frames):
+    """
+    Concatenates DataFrames while keeping categorical columns categorical.
+
+    pd.concat turns categorical columns with different categories into
+    object columns; here the categories of each column are unioned instead.
+    Columns encoded with `encode_shared` only need their codes concatenated.
+    Either way the result holds only the categories in use, sorted.
+
+    Args:
+        frames (list): DataFrames with the same columns.
+
+    Returns:
+        pd.DataFrame: The concatenated frame with a fresh RangeIndex.
+    """
+    if not frames:
+        return pd.DataFrame()
+    columns = {}
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categories = _shared_categories(parts)
+            if categories is not None:
+                column = pd.Categorical.from_codes(
+                    np.concatenate([part.cat.codes.to_numpy() for part in parts]),
+                    dtype=pd.CategoricalDtype(categories)
+                ).remove_unused_categories()
+                try:
+                    columns[name] = column.reorder_categories(sorted(column.categories))
+                except TypeError:
+                    columns[name] = column
+                continue
+            try:
+                columns[name] = union_categoricals(parts, sort_categories=True)
+            except TypeError:
+                columns[name] = union_categoricals(parts)
+        else:
+            columns[name] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+def drop_unused_categories(df):
+    """
+    Removes categories that no longer occur in a filtered DataFrame.
+
+    Keeps value_counts, crosstab and groupby results limited to the values
+    actually present, as they were with plain string columns.
+
+    Args:
+        df (pd.DataFrame): A (filtered) DataFrame.
+
+    Returns:
+        pd.DataFrame: The same rows with unused categories removed.
+    """
+    return df.apply(
+        lambda column: column.cat.remove_unused_categories()
+        if isinstance(column.dtype, pd.CategoricalDtype) else column
+    ) if not df.empty else df
+
+def _job_tables(yaml_data):
+    tables = build_job_tables(yaml_data)
+    return {'builds': tables['builds'], 'job_tests': tables['tests'], 'job_problems': tables['problems']}
+
+def _device_table(yaml_data, file_name):
+    return None if validate_yaml_data(yaml_data) else extract_data(yaml_data, file_name)
+
+def list_yaml_entries(source, refresh=False):
+    """
+    Lists the YAML files of a data source with their size and modified time.
+
+    Directory indexes are scanned for .yml/.yaml links; local directories and
+    file:// URLs are listed directly. Listings are shared by every session
+    and page of the process and refreshed after `CACHE_TTL` seconds.
+
+    Args:
+        source (str): The base URL or local directory to fetch YAML files from.
+        refresh (bool): Re-list the source even if a cached listing is fresh.
+
+    Returns:
+        list: Dicts with the 'path', 'size' and 'modified' of each YAML file.
+
+    Raises:
+        Exception: If there is an error fetching the YAML files.
+    """
+    def load():
+        if is_local_source(source):
+            return list_local_yaml_entries(source)
+        content, _ = cached_get(source)
+        return parse_index_html(content, source)
+    return _cached(('listing', source), load, refresh)
+
+def list_yaml_files(source, refresh=False):
+    """
+    Lists the YAML files of a data source.
+
+    Args:
+        source (str): The base URL or local directory to fetch YAML files from.
+        refresh (bool): Re-list the source even if a cached listing is fresh.
+
+    Returns:
+        list: A list of full URLs (or paths) to YAML files.
+
+    Raises:
+        Exception: If there is an error fetching the YAML files.
+    """
+    return [entry['path'] for entry in list_yaml_entries(source, refresh)]
+
+def load_file_data(path, refresh=False):
+    """
+    Fetches, parses and extracts a single YAML file for both dashboard pages.
+
+    The file is fetched and parsed at most once per process and `CACHE_TTL`
+    period; every session and page reads the same result. The returned
+    DataFrames are shared and must not be modified in place.
+
+    Args:
+        path (str): The URL or local path of the YAML file.
+        refresh (bool): Revalidate the file even if the cached result is fresh.
+
+    Returns:
+        tuple: The SHA-256 of the file's bytes and a dict of tables:
+            'builds' and 'job_tests' hold the Main Dashboard tables (None if
+            the document is invalid), 'job_problems' the entries skipped
+            while extracting them (see `extract_job_data`) and 'devices'
+            the Device page rows (None if the document is invalid).
+
+    Raises:
+        Exception: If the file cannot be fetched or parsed.
+    """
+    file_name = path.split('/')[-1]
+    return _cached(('file', path), lambda: load_tables(path, {
+        ('builds', 'job_tests', 'job_problems'): (JOB_EXTRACTOR_KEY, _job_tables),
+        'devices': (f"{DEVICE_EXTRACTOR_KEY}:{file_name}", partial(_device_table, file_name=file_name))
+    }), refresh)
+
+def load_all_file_data(file_paths, max_workers=FETCH_WORKERS, refresh=False):
+    """
+    Fetches, parses and extracts several YAML files concurrently.
+
+    At most `max_workers` files are downloaded at once. With
+    `PARSE_PROCESSES` set, up to that many more files are loaded at once so
+    that parsing can use every worker process while downloads continue.
+    Failures are collected and returned instead of being raised.
+
+    Args:
+        file_paths (list): URLs or local paths of the YAML files.
+        max_workers (int): Maximum number of concurrent downloads.
+        refresh (bool): Revalidate every file even if its cached result is fresh.
+
+    Returns:
+        tuple: A list of (file_path, digest, tables) triples in the order of
+            `file_paths`, where digest and tables are returned by
+            `load_file_data`, and a list of (file_path, error message) pairs
+            for failed files.
+    """
+    results = {}
+    errors = []
+    # A thread waiting on the parse process pool holds no download; the
+    # session's blocking connection pool keeps downloads at FETCH_WORKERS,
+    # so one more thread per parse process keeps every process busy.
+    workers = max(1, max_workers) + max(0, PARSE_PROCESSES)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(load_file_data, path, refresh): path for path in file_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                errors.append((path, str(e)))
+    loaded = [(path, *results[path]) for path in file_paths if path in results]
+    errors.sort(key=lambda error: file_paths.index(error[0]))
+    return loaded, errors
+
+def combined_table(dataset, name):
+    """
+    Returns one table of a dataset with the rows of all its files combined.
+
+    The frames are concatenated once, in file order, and the result is kept
+    on the dataset, so later reruns against the same dataset version reuse
+    it. Files without rows for the table are skipped. Unchanged files keep
+    their extracted tables across dataset versions (see `load_tables`), and
+    all tables share one dictionary per column (see `encode_shared`), so a
+    new version only re-extracts changed files and combining is a copy of
+    integer codes.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        name (str): The table name, 'builds', 'job_tests' or 'devices'.
+
+    Returns:
+        pd.DataFrame: The combined rows with a RangeIndex, or an empty frame.
+    """
+    combined = dataset.setdefault('combined', {})
+    if name not in combined:
+        frames = [
+            dataset['tables'][path][name] for path in dataset['files']
+            if path in dataset['tables']
+            and dataset['tables'][path][name] is not None
+            and not dataset['tables'][path][name].empty
+        ]
+        combined[name] = concat_categorical(frames)
+    return combined[name]
+
+def combined_aggregate(dataset, name, key, compute):
+    """
+    Returns a per-file aggregate of one table, combined over all files of a dataset.
+
+    `compute` runs once per file content: its results are kept by file path
+    and content digest across dataset versions, so when a file changes or
+    appears only that file's aggregate is recomputed, and the small
+    per-file results are concatenated. The combined result is kept on the
+    dataset like `combined_table`.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        name (str): The table name, see `combined_table`.
+        key (str): Identifies `compute`; it must change whenever the
+            aggregate's output changes.
+        compute (callable): Turns one file's non-empty table into a
+            DataFrame whose rows can be concatenated across files.
+
+    Returns:
+        pd.DataFrame: The concatenated per-file aggregates, or an empty frame.
+    """
+    combined = dataset.setdefault('combined', {})
+    if (name, key) not in combined:
+        parts = []
+        for path in dataset['files']:
+            table = dataset['tables'].get(path, {}).get(name)
+            if table is None or table.empty:
+                continue
+            memo_key = (key, name, path)
+            memo = _aggregates_memo.get(memo_key)
+            if not memo or memo[0] != dataset['digests'][path]:
+                memo = _aggregates_memo[memo_key] = (dataset['digests'][path], compute(table))
+            parts.append(memo[1])
+        combined[(name, key)] = concat_categorical(parts)
+    return combined[(name, key)]
+
+def _build_dataset(source, refresh):
+    entries = list_yaml_entries(source, refresh)
+    files = [entry['path'] for entry in entries]
+    loaded, failures = load_all_file_data(files, refresh=refresh)
+    digests = {path: digest for path, digest, _ in loaded}
+    tables = {path: file_tables for path, _, file_tables in loaded}
+    previous = _datasets.get(source)
+    # A file that still exists but fails to revalidate keeps its previous
+    # tables, so a short outage during a refresh does not empty the pages.
+    errors = []
+    stale = []
+    for path, message in failures:
+        if previous and path in previous['tables']:
+            digests[path] = previous['digests'][path]
+            tables[path] = previous['tables'][path]
+            stale.append((path, message))
+        else:
+            errors.append((path, message))
+    if (previous and previous['files'] == files and previous['errors'] == errors
+            and previous['stale'] == stale and previous['digests'] == digests):
+        return previous
+    dataset = {
+        'source': source,
+        'version': previous['version'] + 1 if previous else 1,
+        'files': files,
+        'entries': entries,
+        'digests': digests,
+        'tables': tables,
+        'errors': errors,
+        'stale': stale,
+        'refreshed_at': time.time()
+    }
+    _datasets[source] = dataset
+    for listener in list(_dataset_listeners):
+        try:
+            listener(dataset)
+        except Exception as e:
+            logger.error(f"Dataset listener {listener} failed: {e}")
+    return dataset
+
+def add_dataset_listener(callback):
+    """
+    Registers a callback for new dataset versions.
+
+    The callback receives every new dataset, as described in `get_dataset`,
+    right after it is swapped in, on the thread that built it. Datasets
+    built before the callback was registered are passed to it right away,
+    so the order in which pages import their modules does not matter. It
+    should hand long work to another thread.
+
+    Args:
+        callback (callable): Called with the new dataset.
+    """
+    if callback in _dataset_listeners:
+        return
+    _dataset_listeners.append(callback)
+    for dataset in list(_datasets.values()):
+        try:
+            callback(dataset)
+        except Exception as e:
+            logger.error(f"Dataset listener {callback} failed: {e}")
+
+def refresh_dataset(source=DATA_SOURCE):
+    """
+    Re-lists a data source, revalidates its files and swaps in the new dataset.
+
+    Unchanged files are answered from the HTTP and row caches, so only new
+    or changed files are downloaded and extracted. Readers keep seeing the
+    previous dataset until the new one is complete; if nothing changed the
+    previous dataset, and its version, is kept. Files that were loaded
+    before but fail to revalidate keep their previous tables and are
+    listed in 'stale'.
+
+    Args:
+        source (str): The base URL or local directory of the YAML files.
+
+    Returns:
+        dict: The new dataset, as described in `get_dataset`.
+    """
+    dataset = _build_dataset(source, refresh=True)
+    logger.info(
+        f"Refreshed {source}: {len(dataset['tables'])} files, {len(dataset['errors'])} errors, "
+        f"{len(dataset['stale'])} stale"
+    )
+    return dataset
+
+def _refresh_loop(source, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_dataset(source)
+        except Exception as e:
+            logger.error(f"Background refresh of {source} failed: {e}")
+
+def start_background_refresh(source=DATA_SOURCE, interval=REFRESH_INTERVAL):
+    """
+    Starts the process-wide background refresher for a data source.
+
+    The refresher calls `refresh_dataset` every `interval` seconds on a
+    daemon thread. Calling this again for the same source does nothing.
+
+    Args:
+        source (str): The base URL or local directory of the YAML files.
+        interval (int): Seconds between refreshes.
+    """
+    with _refresh_lock:
+        if source in _refresh_threads:
+            return
+        thread = threading.Thread(
+            target=_refresh_loop, args=(source, interval),
+            name="tuxconfig-refresh", daemon=True
+        )
+        _refresh_threads[source] = thread
+        thread.start()
+
+def get_dataset(source=DATA_SOURCE):
+    """
+    Returns every file of a data source with its extracted tables.
+
+    With `REFRESH_INTERVAL` set (TUXCONFIG_REFRESH_INTERVAL seconds), the
+    first call loads the dataset and starts the background refresher; later
+    calls return the latest refreshed dataset without touching the network.
+    Otherwise listings and files are revalidated lazily after `CACHE_TTL`.
+
+    Args:
+        source (str): The base URL or local directory of the YAML files.
+
+    Returns:
+        dict: 'files' lists the YAML files, 'entries' holds their listing
+            metadata as returned by `list_yaml_entries`, 'digests' and
+            'tables' map each loaded file to the SHA-256 of its content and
+            the tables returned by `load_file_data`, 'errors' holds
+            (file_path, error message) pairs for files that failed to load,
+            'stale' the same pairs for files that failed to revalidate and
+            still show their previously loaded tables, and 'version'
+            increases with every refresh.
+
+    Raises:
+        Exception: If the source cannot be listed.
+    """
+    if REFRESH_INTERVAL <= 0:
+        return _build_dataset(source, refresh=False)
+
+    dataset = _datasets.get(source)
+    if dataset is None:
+        dataset = _cached(('dataset', source), lambda: refresh_dataset(source))
+    start_background_refresh(source, REFRESH_INTERVAL)
+    return dataset
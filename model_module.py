@@ -0,0 +1,446 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ingest_module import (
+    BUILD_COLUMNS, JOB_COLUMNS, JOB_TEST_COLUMNS, concat_categorical, drop_unused_categories
+)
+from query_module import count_expanded_rows, use_duckdb
+
+BUILD_DIMENSIONS = ('file', 'job_name', 'build_name', 'target_arch', 'toolchain')
+TEST_DIMENSIONS = ('test_name', 'device')
+MODEL_COLUMNS = ('file',) + JOB_COLUMNS
+JOB_MODEL_CACHE_SIZE = 16
+ROW_SLICE_LIMIT = 64
+FILTERED_VIEW_CACHE_SIZE = 64
+
+_dataset_cache_lock = threading.Lock()
+
+def build_job_model(builds_frames, test_frames, file_names=None):
+    """
+    Combines per-file builds and job tests tables into one normalized job model.
+
+    The model never stores the build x test product: each build of a job is
+    implicitly paired with each test assignment of the same job. Rows of the
+    expanded view are only produced on demand by `expand_rows`. Job ids are
+    offset per file so that they stay unique across files.
+
+    Args:
+        builds_frames (list): 'builds' tables as returned by `load_file_data`.
+        test_frames (list): The matching 'job_tests' tables.
+        file_names (list): The names of the files the tables come from. When
+            given, the builds table gets a categorical 'file' column that can
+            be filtered and counted like any other build dimension.
+
+    Returns:
+        dict: 'builds' and 'tests' DataFrames sharing a job_id column, and
+            their 'index' (see `index_job_model`).
+    """
+    if not builds_frames:
+        model = {
+            'builds': pd.DataFrame(columns=list(BUILD_COLUMNS) + (['file'] if file_names is not None else [])),
+            'tests': pd.DataFrame(columns=list(JOB_TEST_COLUMNS))
+        }
+        return dict(model, index=index_job_model(model))
+
+    offset = 0
+    offset_builds = []
+    offset_tests = []
+    for position, (builds, tests) in enumerate(zip(builds_frames, test_frames)):
+        offset_file_builds = builds.assign(job_id=builds['job_id'] + offset)
+        if file_names is not None:
+            offset_file_builds['file'] = pd.Categorical.from_codes([0] * len(builds), [file_names[position]])
+        offset_builds.append(offset_file_builds)
+        offset_tests.append(tests.assign(job_id=tests['job_id'] + offset))
+        if not builds.empty:
+            offset += int(builds['job_id'].max()) + 1
+    model = {'builds': concat_categorical(offset_builds), 'tests': concat_categorical(offset_tests)}
+    return dict(model, index=index_job_model(model))
+
+def dataset_lru(dataset, name, key, build, size):
+    """
+    Returns a value kept in a small LRU cache on a dataset, building it on a miss.
+
+    The cache lives on the dataset, so it is dropped with the dataset version.
+    Concurrent misses for the same key may each build the value; the last
+    one is kept.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        name (str): The cache name on the dataset.
+        key: The hashable cache key.
+        build (callable): Builds the value on a miss.
+        size (int): The maximum number of entries kept.
+
+    Returns:
+        The cached or newly built value.
+    """
+    with _dataset_cache_lock:
+        entries = dataset.setdefault(name, OrderedDict())
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+    value = build()
+    with _dataset_cache_lock:
+        entries[key] = value
+        while len(entries) > size:
+            entries.popitem(last=False)
+    return value
+
+def model_paths(dataset, paths):
+    """
+    Normalizes selected file paths to the files a job model is built from.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        paths (list): The selected file paths.
+
+    Returns:
+        tuple: The selected paths in dataset order, without files that
+            failed to load or have an invalid structure.
+    """
+    selected = set(paths)
+    return tuple(
+        path for path in dataset['files']
+        if path in selected and path in dataset['tables'] and dataset['tables'][path]['builds'] is not None
+    )
+
+def dataset_job_model(dataset, paths):
+    """
+    Returns the indexed job model of some files of a dataset.
+
+    The model and its index are built once per dataset version and set of
+    files and kept on the dataset, so reruns only look them up. The files
+    are taken in dataset order; files that failed to load or have an
+    invalid structure are left out.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        paths (list): The selected file paths.
+
+    Returns:
+        dict: A job model as returned by `build_job_model`.
+    """
+    paths = model_paths(dataset, paths)
+    return dataset_lru(dataset, 'job_models', paths, lambda: build_job_model(
+        [dataset['tables'][path]['builds'] for path in paths],
+        [dataset['tables'][path]['job_tests'] for path in paths],
+        [path.split('/')[-1] for path in paths]
+    ), JOB_MODEL_CACHE_SIZE)
+
+def normalize_selections(selections):
+    """
+    Turns dimension selections into a hashable key that ignores order and empty dimensions.
+
+    Args:
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        tuple: Sorted (column, sorted values) pairs of the non-empty selections.
+    """
+    return tuple(sorted(
+        (column, tuple(sorted(set(selected), key=str))) for column, selected in selections.items() if selected
+    ))
+
+def filtered_view(model, selections):
+    """
+    Filters a job model once and expands the matching rows.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        dict: 'model' holds the filtered job model, for the charts, and
+            'rows' its expanded rows (see `expand_rows`), for the exports
+            and the report.
+    """
+    filtered_model = filter_job_model(model, selections)
+    return {'model': filtered_model, 'rows': expand_rows(filtered_model)}
+
+def dataset_filtered_view(dataset, paths, selections):
+    """
+    Returns the filtered view of some files of a dataset, computed once per selection.
+
+    Views are kept on the dataset, keyed by the selected files and
+    `normalize_selections`, so a cache lookup costs a tuple hash and never
+    hashes the data; a new dataset version starts with an empty cache.
+    The returned frames are shared and must not be modified in place.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        paths (list): The selected file paths.
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        dict: The view as returned by `filtered_view`.
+    """
+    paths = model_paths(dataset, paths)
+    key = (paths, normalize_selections(selections))
+    return dataset_lru(
+        dataset, 'filtered_views', key,
+        lambda: filtered_view(dataset_job_model(dataset, paths), selections),
+        FILTERED_VIEW_CACHE_SIZE
+    )
+
+def _index_codes(codes, value_count):
+    order = np.argsort(codes, kind='stable').astype(np.int32 if len(codes) < 2**31 else np.int64)
+    counts = np.bincount(codes[codes >= 0], minlength=value_count)
+    offsets = np.concatenate(([0], np.cumsum(counts))) + int((codes < 0).sum())
+    return {'codes': codes, 'order': order, 'offsets': offsets, 'counts': counts}
+
+def _index_column(column, job_ids):
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype('category')
+    categories = column.cat.categories
+    entry = _index_codes(column.cat.codes.to_numpy(), len(categories))
+    present = np.flatnonzero(entry['counts'])
+    entry['categories'] = categories
+    entry['first_seen'] = present[np.argsort(entry['order'][entry['offsets'][present]])]
+    valid = entry['codes'] >= 0
+    job_values = pd.unique(job_ids[valid] * max(len(categories), 1) + entry['codes'][valid])
+    entry['job_value_jobs'] = job_values // max(len(categories), 1)
+    entry['job_value_codes'] = job_values % max(len(categories), 1)
+    return entry
+
+def index_job_model(model):
+    """
+    Builds the inverted index of a job model.
+
+    For every dimension, the rows holding each value are a slice of one
+    stable argsort of the column's category codes, i.e. a sorted row-id
+    array that is found without scanning the column. Job ids are indexed
+    the same way to link the builds and tests tables. Every dimension also
+    keeps its distinct (job, value) pairs, the values each job co-occurs
+    with, which are usually far fewer than the rows.
+
+    Args:
+        model (dict): 'builds' and 'tests' DataFrames sharing a job_id column.
+
+    Returns:
+        dict: 'builds' and 'tests' map each dimension column, and 'job_id',
+            to its index.
+    """
+    job_ids = {name: model[name]['job_id'].to_numpy(dtype=np.int64) for name in ('builds', 'tests')}
+    job_count = int(max((ids.max() + 1 for ids in job_ids.values() if len(ids)), default=0))
+    index = {}
+    for table_name, dimensions in (('builds', BUILD_DIMENSIONS), ('tests', TEST_DIMENSIONS)):
+        table = model[table_name]
+        index[table_name] = {
+            column: _index_column(table[column], job_ids[table_name])
+            for column in dimensions if column in table.columns
+        }
+        index[table_name]['job_id'] = _index_codes(job_ids[table_name], job_count)
+    return index
+
+def _rows_of(entry, codes):
+    codes = codes[(codes >= 0) & (codes < len(entry['counts']))]
+    if len(codes) == 1:
+        return entry['order'][entry['offsets'][codes[0]]:entry['offsets'][codes[0] + 1]]
+    if len(codes) > ROW_SLICE_LIMIT:
+        # Many values: one vectorized pass over the codes beats joining the slices.
+        # The extra last slot stays False for missing values (code -1).
+        selected = np.zeros(len(entry['counts']) + 1, dtype=bool)
+        selected[codes] = True
+        return np.flatnonzero(selected[entry['codes']])
+    return np.sort(np.concatenate(
+        [entry['order'][entry['offsets'][code]:entry['offsets'][code + 1]] for code in codes] or [entry['order'][:0]]
+    ))
+
+def _value_rows(entry, selected):
+    return _rows_of(entry, entry['categories'].get_indexer(list(selected)))
+
+def _jobs_of(entry, rows):
+    return np.unique(entry['codes'][rows])
+
+def _table_name(column):
+    return 'builds' if column in BUILD_DIMENSIONS else 'tests'
+
+def filter_job_model(model, selections):
+    """
+    Restricts a job model to the selected dimension values.
+
+    The rows of each selected value are sorted row-id arrays read from the
+    model's inverted index: values of one dimension are unioned, dimensions
+    intersected, and builds and tests are then linked through the jobs that
+    still have at least one of each. No column is scanned, so the cost
+    follows the number of matching rows rather than the size of the model.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        selections (dict): Maps dimension columns to lists of selected values.
+            Empty lists leave a dimension unfiltered.
+
+    Returns:
+        dict: A job model holding only the matching builds and tests of jobs
+            that still have at least one of each.
+    """
+    index = model['index']
+    rows = {'builds': None, 'tests': None}
+    for column, selected in selections.items():
+        if not selected:
+            continue
+        table_name = _table_name(column)
+        value_rows = _value_rows(index[table_name][column], selected)
+        rows[table_name] = value_rows if rows[table_name] is None else np.intersect1d(
+            rows[table_name], value_rows, assume_unique=True
+        )
+    if rows['builds'] is None and rows['tests'] is None:
+        return {'builds': model['builds'], 'tests': model['tests']}
+
+    job_sets = [
+        _jobs_of(index[table_name]['job_id'], table_rows)
+        for table_name, table_rows in rows.items() if table_rows is not None
+    ]
+    jobs = job_sets[0] if len(job_sets) == 1 else np.intersect1d(*job_sets, assume_unique=True)
+    filtered = {}
+    for table_name, table_rows in rows.items():
+        job_entry = index[table_name]['job_id']
+        if table_rows is None:
+            table_rows = _rows_of(job_entry, jobs)
+        else:
+            table_rows = table_rows[np.isin(job_entry['codes'][table_rows], jobs)]
+        filtered[table_name] = drop_unused_categories(model[table_name].iloc[table_rows])
+    return filtered
+
+def count_rows(model, columns):
+    """
+    Counts the rows of the expanded view per value of the given columns without expanding.
+
+    Each build counts once per test assignment of its job, and each test
+    assignment once per build of its job. With the DuckDB query backend the
+    counts are computed in SQL (see `query_module.count_expanded_rows`).
+
+    Args:
+        model (dict): A (filtered) job model.
+        columns (list): Dimension columns.
+
+    Returns:
+        pd.Series: Row counts indexed by the observed value combinations.
+    """
+    builds = model['builds']
+    tests = model['tests']
+    if use_duckdb():
+        return count_expanded_rows(builds, tests, columns)
+    if all(column in BUILD_DIMENSIONS for column in columns):
+        table, weights = builds, builds['job_id'].map(tests['job_id'].value_counts())
+    elif all(column in TEST_DIMENSIONS for column in columns):
+        table, weights = tests, tests['job_id'].map(builds['job_id'].value_counts())
+    else:
+        return expand_rows(model).groupby(list(columns), observed=True).size()
+    return weights.groupby([table[column] for column in columns], observed=True).sum()
+
+def option_values(model, column, filter_column=None, selected=None):
+    """
+    Lists the values of a dimension, optionally among rows matching another dimension.
+
+    Uses the model's inverted index: without a selection the values are read
+    from it directly, otherwise only the rows matching the selection (linked
+    through their jobs when `filter_column` is in the other table) are read.
+
+    Args:
+        model (dict): A job model.
+        column (str): The dimension to list.
+        filter_column (str): The dimension `selected` applies to.
+        selected (list): Values of `filter_column`; rows of the expanded view
+            must match one of them. None or empty lists all values.
+
+    Returns:
+        list: The values in order of first appearance.
+    """
+    index = model['index']
+    table_name = _table_name(column)
+    entry = index[table_name][column]
+    if not selected:
+        return list(entry['categories'].take(entry['first_seen']))
+
+    filter_table = _table_name(filter_column)
+    rows = _value_rows(index[filter_table][filter_column], selected)
+    if filter_table != table_name:
+        rows = _rows_of(index[table_name]['job_id'], _jobs_of(index[filter_table]['job_id'], rows))
+    codes = pd.unique(entry['codes'][rows])
+    return list(entry['categories'].take(codes[codes >= 0]))
+
+def cross_filter_options(model, selections):
+    """
+    Lists, for every dimension, the values compatible with the selections on all other dimensions.
+
+    A value is listed if some row of the expanded view has it and matches
+    every selection except the one on its own dimension, so picking a
+    device narrows the build names as much as the reverse. Dimensions of
+    the same table are matched row by row through the inverted index;
+    across tables, only the jobs matching the other table's selections are
+    looked up in the precomputed (job, value) pairs, without reading rows.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        dict: Maps every dimension column of the model to its values, in
+            order of first appearance.
+    """
+    index = model['index']
+    selected_rows = {
+        column: _value_rows(index[_table_name(column)][column], selected)
+        for column, selected in selections.items() if selected
+    }
+
+    def matching_rows(table_name, excluded=None):
+        rows = None
+        for column, value_rows in selected_rows.items():
+            if column != excluded and _table_name(column) == table_name:
+                rows = value_rows if rows is None else np.intersect1d(rows, value_rows, assume_unique=True)
+        return rows
+
+    matching_jobs = {}
+    for table_name in ('builds', 'tests'):
+        rows = matching_rows(table_name)
+        matching_jobs[table_name] = None if rows is None else _jobs_of(index[table_name]['job_id'], rows)
+
+    options = {}
+    for table_name, other_table in (('builds', 'tests'), ('tests', 'builds')):
+        jobs = matching_jobs[other_table]
+        for column, entry in index[table_name].items():
+            if column == 'job_id':
+                continue
+            rows = matching_rows(table_name, excluded=column)
+            if rows is None and jobs is None:
+                codes = entry['first_seen']
+            else:
+                present = np.zeros(len(entry['categories']), dtype=bool)
+                if rows is None:
+                    job_mask = np.zeros(len(index[table_name]['job_id']['counts']), dtype=bool)
+                    job_mask[jobs] = True
+                    present[entry['job_value_codes'][job_mask[entry['job_value_jobs']]]] = True
+                else:
+                    if jobs is not None:
+                        rows = rows[np.isin(index[table_name]['job_id']['codes'][rows], jobs)]
+                    codes = entry['codes'][rows]
+                    present[codes[codes >= 0]] = True
+                codes = entry['first_seen'][present[entry['first_seen']]]
+            options[column] = list(entry['categories'].take(codes))
+    return options
+
+def expand_rows(model):
+    """
+    Produces the build x test rows of a (filtered) job model.
+
+    Args:
+        model (dict): A job model, normally already filtered.
+
+    Returns:
+        pd.DataFrame: One row per build and test assignment of the same job,
+            with the columns of `MODEL_COLUMNS` present in the model and a
+            test_count column holding the number of rows per build name (per
+            file and build name when the model has a 'file' column).
+    """
+    rows = model['builds'].merge(model['tests'], on='job_id', sort=False)
+    columns = [column for column in MODEL_COLUMNS if column in rows.columns]
+    rows = drop_unused_categories(rows[columns].reset_index(drop=True))
+    build_keys = [column for column in ('file', 'build_name') if column in rows.columns]
+    return rows.assign(
+        test_count=rows.groupby(build_keys, observed=True)['test_name'].transform('count')
+    )
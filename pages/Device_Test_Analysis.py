@@ -1,10 +1,5 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import yaml
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 import plotly.graph_objects as go
 from jinja2 import Template
 import json
@@ -12,128 +7,26 @@ import plotly.io as pio
 import tempfile
 import os
 from dashboard_module import generate_device_analysis_report
+from ingest_module import DATA_SOURCE, combined_aggregate, combined_table, drop_unused_categories, get_dataset
+from query_module import count_distinct, filter_rows, pivot_sum
 
-BASE_URL = "https://people.linaro.org/~naresh.kamboju/lkft-common/tuxconfig/"
+BASE_URL = DATA_SOURCE
+DEVICE_TEST_COUNTS_KEY = "device-test-counts-v1"
 
-@st.cache_data
-def get_yaml_files_from_url(url):
+def count_device_tests(device_data):
     """
-    Fetches a list of YAML file URLs from a given base URL.
+    Counts the rows of each device, test and file combination.
 
-    Args:
-        url (str): The base URL to fetch YAML files from.
-
-    Returns:
-        list: A list of full URLs to YAML files.
-
-    Raises:
-        Exception: If there is an error fetching the YAML files.
-    """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        yaml_files = [a['href'] for a in soup.find_all('a', href=True) 
-                     if a['href'].endswith(('.yml', '.yaml'))]
-        return [urljoin(url, file) for file in yaml_files]
-    except Exception as e:
-        st.error(f"Error fetching YAML files: {e}")
-        return []
-
-@st.cache_data
-def load_yaml_data(file_path):
-    """
-    Loads and parses YAML data from a given file path.
+    The charts only need these counts, which are much smaller than the rows
+    and are computed once per file content (see `combined_aggregate`).
 
     Args:
-        file_path (str): The path to the YAML file.
+        device_data (pd.DataFrame): Device rows as returned by `extract_data`.
 
     Returns:
-        dict: Parsed YAML data.
-
-    Raises:
-        Exception: If there is an error loading the YAML file.
+        pd.DataFrame: The device, test and file columns and a count column.
     """
-    try:
-        response = requests.get(file_path)
-        response.raise_for_status()
-        return yaml.safe_load(response.text)
-    except Exception as e:
-        st.error(f"Error loading YAML file: {e}")
-        return None
-
-def extract_data(yaml_data, file_name):
-    """
-    Extracts device and test information from YAML data.
-
-    Args:
-        yaml_data (dict): The parsed YAML data.
-        file_name (str): The name of the YAML file.
-
-    Returns:
-        pd.DataFrame: A DataFrame containing device and test information.
-    """
-    data = []
-    
-    for job in yaml_data.get('jobs', []):
-        job_name = job.get('name', 'Unknown')
-        
-        for test in job.get('tests', []):
-            device = test.get('device', 'unspecified')
-            if device == 'unspecified':
-                continue
-            tests = test.get('tests', [])
-            if not isinstance(tests, list):
-                tests = [tests]
-            
-            for test_name in tests:
-                if test_name is not None:
-                    data.append({
-                        'device': device,
-                        'test': str(test_name),
-                        'file': file_name,
-                        'level': 'job'
-                    })
-        
-        for build in job.get('builds', []):
-            build_name = build.get('build_name', '')
-            
-            for test in build.get('tests', []):
-                device = test.get('device', 'unspecified')
-                if device == 'unspecified':
-                    continue
-                tests = test.get('tests', [])
-                if not isinstance(tests, list):
-                    tests = [tests]
-                
-                for test_name in tests:
-                    if test_name is not None:
-                        data.append({
-                            'device': device,
-                            'test': str(test_name),
-                            'file': file_name,
-                            'level': 'build'
-                        })
-            
-            if build.get('targets'):
-                targets = build.get('targets', [])
-                if isinstance(targets, list):
-                    devices = set()
-                    for test in build.get('tests', []):
-                        device = test.get('device', 'unspecified')
-                        if device != 'unspecified':
-                            devices.add(device)
-                    
-                    for target in targets:
-                        for device in devices:
-                            data.append({
-                                'device': device,
-                                'test': str(target),
-                                'file': file_name,
-                                'level': 'target'
-                            })
-    
-    return pd.DataFrame(data)
+    return device_data.groupby(['device', 'test', 'file'], observed=True).size().reset_index(name='count')
 
 def create_dynamic_filename(base_name, components):
     """
@@ -161,9 +54,11 @@ def main():
     Workflow:
     1. Set up the Streamlit page layout and title.
     2. Fetch YAML files from the specified BASE_URL.
-    3. Load and parse each YAML file to extract relevant data.
-    4. Concatenate all extracted data into a single DataFrame.
-    5. Display filters in the sidebar for devices and tests.
+    3. Load and parse the YAML files concurrently and extract relevant data.
+    4. Combine the extracted data of all files into a single DataFrame, once per dataset version,
+       and the per-file device/test counts, once per file content.
+    5. Display filters in the sidebar for devices and tests; filters and chart aggregates run
+       through the configured query backend (see `query_module`).
     6. Generate and display visualizations:
        - Bar chart for the number of tests per device.
        - Bar chart for the number of devices per test.
@@ -177,42 +72,56 @@ def main():
     st.set_page_config(page_title="Linux Kernel Device and Test Analysis",layout="wide", page_icon="favicon.ico")
     st.title("Device and Test Analysis")
     
-    yaml_files = get_yaml_files_from_url(BASE_URL)
+    try:
+        with st.spinner("Fetching configuration files..."):
+            dataset = get_dataset(BASE_URL)
+    except Exception as e:
+        st.error(f"Error fetching YAML files: {e}")
+        return
+    yaml_files = dataset['files']
     if not yaml_files:
         st.error("No YAML files found")
         return
     
-    all_data = pd.DataFrame()
-    for file in yaml_files:
-        yaml_data = load_yaml_data(file)
-        if yaml_data:
-            file_name = file.split('/')[-1]
-            df = extract_data(yaml_data, file_name)
-            if not df.empty:
-                all_data = pd.concat([all_data, df])
+    load_errors = dataset['errors']
+    if load_errors:
+        st.warning(f"Failed to load {len(load_errors)} of {len(yaml_files)} YAML files")
+        with st.expander("Load errors"):
+            for file, error in load_errors:
+                st.text(f"{file.split('/')[-1]}: {error}")
+    stale_files = dataset['stale']
+    if stale_files:
+        st.warning(f"Showing previously loaded data for {len(stale_files)} of {len(yaml_files)} YAML files")
+        with st.expander("Refresh errors"):
+            for file, error in stale_files:
+                st.text(f"{file.split('/')[-1]}: {error}")
+
+    all_data = combined_table(dataset, 'devices')
     
     if all_data.empty:
         st.error("No data found")
         return
     
+    all_counts = combined_aggregate(dataset, 'devices', DEVICE_TEST_COUNTS_KEY, count_device_tests)
+    
     st.sidebar.header("Filters")
     
-    devices = sorted(all_data['device'].unique())
+    devices = sorted(all_counts['device'].unique())
     selected_devices = st.sidebar.multiselect("Select Devices", devices)
     
-    tests = sorted(all_data['test'].unique())
+    tests = sorted(all_counts['test'].unique())
     selected_tests = st.sidebar.multiselect("Select Tests", tests)
     
-    filtered_data = all_data
-    if selected_devices:
-        filtered_data = filtered_data[filtered_data['device'].isin(selected_devices)]
-    if selected_tests:
-        filtered_data = filtered_data[filtered_data['test'].isin(selected_tests)]
+    selections = {'device': selected_devices, 'test': selected_tests}
+    filtered_data = filter_rows(all_data, selections)
+    filtered_counts = filter_rows(all_counts, selections)
+    filtered_data = drop_unused_categories(filtered_data)
+    filtered_counts = drop_unused_categories(filtered_counts)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        device_test_counts = filtered_data.groupby('device')['test'].nunique().sort_values(ascending=True)
+        device_test_counts = count_distinct(filtered_counts, 'device', 'test').sort_values(ascending=True)
         height = max(400, len(device_test_counts) * 30)
         fig1 = px.bar(
             x=device_test_counts.values,
@@ -250,7 +159,7 @@ def main():
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        test_device_counts = filtered_data.groupby('test')['device'].nunique().sort_values(ascending=True)
+        test_device_counts = count_distinct(filtered_counts, 'test', 'device').sort_values(ascending=True)
         height = max(400, len(test_device_counts) * 30)
         fig2 = px.bar(
             x=test_device_counts.values,
@@ -287,10 +196,7 @@ def main():
         )
         st.plotly_chart(fig2, use_container_width=True)
     
-    pivot_data = pd.crosstab(
-        filtered_data['device'],
-        filtered_data['file']
-    )
+    pivot_data = pivot_sum(filtered_counts, index='device', columns='file', values='count')
     fig3 = go.Figure(data=go.Heatmap(
         z=pivot_data.values,
         x=pivot_data.columns,
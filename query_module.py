@@ -0,0 +1,207 @@
+import logging
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+QUERY_BACKEND = os.environ.get("TUXCONFIG_QUERY_BACKEND", "pandas").lower()
+
+logger = logging.getLogger(__name__)
+
+if QUERY_BACKEND not in ('pandas', 'duckdb'):
+    logger.warning(f"Unknown query backend {QUERY_BACKEND}, using pandas")
+    QUERY_BACKEND = 'pandas'
+elif QUERY_BACKEND == 'duckdb' and duckdb is None:
+    logger.warning("duckdb is not installed, using the pandas query backend")
+    QUERY_BACKEND = 'pandas'
+logger.info(f"Using query backend: {QUERY_BACKEND}")
+
+_connection = None
+_connection_lock = threading.Lock()
+
+def use_duckdb():
+    """
+    Tells whether filters and aggregates run in DuckDB.
+
+    Returns:
+        bool: True if TUXCONFIG_QUERY_BACKEND is 'duckdb' and duckdb is importable.
+    """
+    return QUERY_BACKEND == 'duckdb'
+
+def _cursor():
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            _connection = duckdb.connect()
+        return _connection.cursor()
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+def _where(selections):
+    conditions = [
+        f"list_contains(${column}, CAST({_quote(column)} AS VARCHAR))"
+        for column, selected in selections.items() if selected
+    ]
+    parameters = {column: [str(value) for value in selected] for column, selected in selections.items() if selected}
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), parameters
+
+def query(sql, parameters=None, **frames):
+    """
+    Runs a SQL query over DataFrames in the in-process DuckDB database.
+
+    Each query gets its own cursor, so the frames are only visible to it and
+    queries from several threads run side by side; DuckDB itself scans and
+    aggregates on all cores. Frames are read in place through Arrow, and
+    categorical columns come back as categoricals with the same categories.
+    DuckDB returns them as ordered, so they are made unordered again to
+    match the pandas backend. DuckDB has no enum without values, so
+    categorical columns without categories are passed as strings and
+    returned as categoricals without categories.
+
+    Args:
+        sql (str): The query, referring to the frames by their keyword names.
+        parameters (dict): Named query parameters.
+        **frames (pd.DataFrame): The tables of the query.
+
+    Returns:
+        pd.DataFrame: The query result.
+    """
+    empty_categoricals = set()
+    for name, frame in frames.items():
+        columns = [
+            column for column, dtype in frame.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype) and len(dtype.categories) == 0
+        ]
+        if columns:
+            frames[name] = frame.astype(dict.fromkeys(columns, 'string'))
+            empty_categoricals.update(columns)
+    cursor = _cursor()
+    try:
+        for name, frame in frames.items():
+            cursor.register(name, frame)
+        result = cursor.execute(sql, parameters or {}).df()
+    finally:
+        cursor.close()
+    for column, dtype in result.dtypes.items():
+        if getattr(dtype, 'ordered', False):
+            result[column] = result[column].cat.as_unordered()
+        elif column in empty_categoricals and not isinstance(dtype, pd.CategoricalDtype):
+            result[column] = pd.Categorical([None] * len(result))
+    return result
+
+def count_expanded_rows(builds, tests, columns):
+    """
+    Counts the build x test rows of a job model per value of some columns in DuckDB.
+
+    When all columns come from one table, the other table is first reduced
+    to a row count per job, like `model_module.count_rows`; otherwise the
+    tables are joined on job_id.
+
+    Args:
+        builds (pd.DataFrame): The builds table of a job model.
+        tests (pd.DataFrame): The tests table of a job model.
+        columns (list): Dimension columns of either table.
+
+    Returns:
+        pd.Series: Row counts indexed by the observed value combinations, in
+            category order.
+    """
+    selected = ', '.join(_quote(column) for column in columns)
+    if all(column in builds.columns for column in columns):
+        sql = (f"WITH per_job AS (SELECT job_id, count(*) AS n FROM tests GROUP BY job_id) "
+               f"SELECT {selected}, CAST(sum(n) AS BIGINT) AS count FROM builds JOIN per_job USING (job_id) "
+               f"GROUP BY {selected} ORDER BY {selected}")
+    elif all(column in tests.columns for column in columns):
+        sql = (f"WITH per_job AS (SELECT job_id, count(*) AS n FROM builds GROUP BY job_id) "
+               f"SELECT {selected}, CAST(sum(n) AS BIGINT) AS count FROM tests JOIN per_job USING (job_id) "
+               f"GROUP BY {selected} ORDER BY {selected}")
+    else:
+        sql = (f"SELECT {selected}, count(*) AS count FROM builds JOIN tests USING (job_id) "
+               f"GROUP BY {selected} ORDER BY {selected}")
+    counts = query(
+        sql,
+        builds=builds[['job_id'] + [column for column in columns if column in builds.columns]],
+        tests=tests[['job_id'] + [column for column in columns if column in tests.columns]]
+    )
+    return counts.set_index(list(columns))['count']
+
+def filter_rows(frame, selections):
+    """
+    Keeps the rows matching every non-empty selection.
+
+    Args:
+        frame (pd.DataFrame): The rows to filter.
+        selections (dict): Maps columns to lists of accepted values.
+
+    Returns:
+        pd.DataFrame: The matching rows. Under DuckDB they have a RangeIndex,
+            and when no row matches their categorical columns come back
+            without categories.
+    """
+    if not any(selections.values()):
+        return frame
+    if use_duckdb():
+        where, parameters = _where(selections)
+        return query(f"SELECT * FROM frame {where}", parameters, frame=frame)
+    for column, selected in selections.items():
+        if selected:
+            frame = frame[frame[column].isin(selected)]
+    return frame
+
+def count_distinct(frame, by, column):
+    """
+    Counts the distinct values of one column per value of another.
+
+    Args:
+        frame (pd.DataFrame): The rows to count.
+        by (str): The grouping column.
+        column (str): The column whose distinct values are counted.
+
+    Returns:
+        pd.Series: The counts indexed by the observed values of `by`.
+    """
+    if use_duckdb():
+        counts = query(
+            f"SELECT {_quote(by)}, count(DISTINCT {_quote(column)}) AS count FROM frame "
+            f"GROUP BY {_quote(by)} ORDER BY {_quote(by)}",
+            frame=frame[[by, column]]
+        )
+        return counts.set_index(by)['count'].rename(column)
+    return frame.groupby(by, observed=True)[column].nunique()
+
+def pivot_sum(frame, index, columns, values):
+    """
+    Sums a column per value pair of two others, as a zero-filled table.
+
+    Under DuckDB the sums are computed in SQL and only the (small) result is
+    reshaped in pandas.
+
+    Args:
+        frame (pd.DataFrame): The rows to sum.
+        index (str): The column giving the table rows.
+        columns (str): The column giving the table columns.
+        values (str): The column to sum.
+
+    Returns:
+        pd.DataFrame: The sums, indexed by `index` values with one column per `columns` value.
+    """
+    if use_duckdb():
+        frame = query(
+            f"SELECT {_quote(index)}, {_quote(columns)}, CAST(sum({_quote(values)}) AS BIGINT) AS {_quote(values)} "
+            f"FROM frame GROUP BY {_quote(index)}, {_quote(columns)}",
+            frame=frame[[index, columns, values]]
+        )
+    return frame.pivot_table(
+        index=index,
+        columns=columns,
+        values=values,
+        aggfunc='sum',
+        fill_value=0,
+        observed=True
+    )
@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from io import BytesIO
+
+import pandas as pd
+
+from charts_module import (
+    create_arch_pie_chart, create_build_test_scatter, create_test_count_line_chart,
+    create_toolchain_bar_chart, create_toolchain_heatmap
+)
+from ingest_module import add_dataset_listener
+from model_module import (
+    dataset_filtered_view, dataset_job_model, dataset_lru, filtered_view, model_paths, normalize_selections,
+    option_values
+)
+
+VIEWS_FILE = os.environ.get(
+    "TUXCONFIG_VIEWS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_views.json")
+)
+VIEW_RESULTS_CACHE_SIZE = 32
+
+logger = logging.getLogger(__name__)
+
+_views_lock = threading.Lock()
+_pinned_results_lock = threading.Lock()
+
+def load_saved_views():
+    """
+    Reads the named saved views.
+
+    Returns:
+        dict: Maps view names to dicts with the selected file names ('files')
+            and the dimension selections ('selections'). Empty if no view
+            was saved yet or the file is unreadable.
+    """
+    try:
+        with open(VIEWS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable saved views {VIEWS_FILE}: {e}")
+        return {}
+
+def _write_saved_views(views):
+    directory = os.path.dirname(VIEWS_FILE) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(views, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, VIEWS_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def save_view(name, file_names, selections):
+    """
+    Saves, or replaces, a named view.
+
+    Args:
+        name (str): The view name.
+        file_names (list): The names of the selected YAML files.
+        selections (dict): Maps dimension columns to lists of selected values,
+            stored as strings.
+    """
+    with _views_lock:
+        views = load_saved_views()
+        views[name] = {
+            'files': list(file_names),
+            'selections': {
+                column: [str(value) for value in values] for column, values in normalize_selections(selections)
+            }
+        }
+        _write_saved_views(views)
+
+def delete_view(name):
+    """
+    Deletes a named view if it exists.
+
+    Args:
+        name (str): The view name.
+    """
+    with _views_lock:
+        views = load_saved_views()
+        if views.pop(name, None) is not None:
+            _write_saved_views(views)
+
+def view_paths(dataset, file_names):
+    """
+    Resolves the file names of a view to the paths of a dataset.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        file_names (list): YAML file names, as stored in saved views and URLs.
+
+    Returns:
+        list: The matching file paths in dataset order; unknown names are dropped.
+    """
+    names = set(file_names)
+    return [path for path in dataset['files'] if path.split('/')[-1] in names]
+
+def restore_values(model, column, values):
+    """
+    Maps values read back as strings, from the URL or a saved view, to the values of a model column.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        column (str): The dimension column.
+        values (list): The values as strings.
+
+    Returns:
+        list: The matching model values; values not in the model are dropped.
+    """
+    known_values = {str(value): value for value in option_values(model, column)}
+    return [known_values[value] for value in values if value in known_values]
+
+def restore_selections(model, selections):
+    """
+    Maps selections read back as strings to the values of a model.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        selections (dict): Maps dimension columns to lists of values as strings.
+
+    Returns:
+        dict: The selections with model values, see `restore_values`.
+    """
+    return {column: restore_values(model, column, values) for column, values in selections.items()}
+
+def export_excel(rows):
+    """
+    Writes the filtered rows to an Excel workbook.
+
+    Args:
+        rows (pd.DataFrame): The expanded rows of a filtered view.
+
+    Returns:
+        bytes: The .xlsx file content.
+    """
+    excel_buffer = BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
+        rows.to_excel(writer, index=False, sheet_name='Filtered Data')
+    return excel_buffer.getvalue()
+
+def render_view(view):
+    """
+    Builds the Main Dashboard figures and exports of a filtered view.
+
+    Args:
+        view (dict): A filtered view as returned by `filtered_view`.
+
+    Returns:
+        dict: The view's 'model' and 'rows', 'figures' mapping the chart
+            names to Plotly figures (empty if no rows match), and the
+            'excel' and 'csv' exports as bytes.
+    """
+    filtered_model = view['model']
+    rows = view['rows']
+    figures = {}
+    if not rows.empty:
+        figures = {
+            'toolchain_heatmap': create_toolchain_heatmap(filtered_model),
+            'arch_pie': create_arch_pie_chart(filtered_model),
+            'toolchain_bar': create_toolchain_bar_chart(filtered_model),
+            'build_test_scatter': create_build_test_scatter(rows),
+            'test_count_line': create_test_count_line_chart(filtered_model)
+        }
+    return dict(
+        view, figures=figures, excel=export_excel(rows), csv=rows.to_csv(index=False).encode('utf-8')
+    )
+
+def _view_key(dataset, paths, selections):
+    return model_paths(dataset, paths), normalize_selections(selections)
+
+def view_results(dataset, paths, selections):
+    """
+    Returns the figures and exports of a view of a dataset, built once per dataset version.
+
+    Results pinned by `pin_view_results`, such as those of saved views, are
+    only looked up. Other results are kept in a small LRU on the dataset
+    with the same key as `dataset_filtered_view`. The returned figures are
+    shared and must not be modified in place.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        paths (list): The selected file paths.
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        dict: The rendered view, see `render_view`.
+    """
+    key = _view_key(dataset, paths, selections)
+    with _pinned_results_lock:
+        results = dataset.get('pinned_view_results', {}).get(key)
+    if results is not None:
+        return results
+    return dataset_lru(
+        dataset, 'view_results', key,
+        lambda: render_view(dataset_filtered_view(dataset, paths, selections)),
+        VIEW_RESULTS_CACHE_SIZE
+    )
+
+def pin_view_results(dataset, paths, selections):
+    """
+    Builds the results of a view and keeps them on the dataset until the next version.
+
+    Unlike the LRU of `view_results`, pinned results are never evicted, so
+    browsing other selections does not push saved views out.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+        paths (list): The selected file paths.
+        selections (dict): Maps dimension columns to lists of selected values.
+    """
+    results = view_results(dataset, paths, selections)
+    with _pinned_results_lock:
+        dataset.setdefault('pinned_view_results', {})[_view_key(dataset, paths, selections)] = results
+
+def model_view_results(model, selections):
+    """
+    Builds the figures and exports of a view of a job model without caching.
+
+    Args:
+        model (dict): A job model from `build_job_model`.
+        selections (dict): Maps dimension columns to lists of selected values.
+
+    Returns:
+        dict: The rendered view, see `render_view`.
+    """
+    return render_view(filtered_view(model, selections))
+
+def precompute_saved_views(dataset):
+    """
+    Builds and pins the results of every saved view for a dataset.
+
+    The stored selections are mapped to model values like the dashboard
+    does when a view is opened, so both use the same pinned entry.
+
+    Args:
+        dataset (dict): A dataset returned by `get_dataset`.
+    """
+    for name, view in load_saved_views().items():
+        try:
+            paths = view_paths(dataset, view['files'])
+            selections = restore_selections(dataset_job_model(dataset, paths), view['selections'])
+            pin_view_results(dataset, paths, selections)
+        except Exception as e:
+            logger.error(f"Precomputing saved view {name} failed: {e}")
+    logger.info(f"Precomputed saved views for {dataset['source']} version {dataset['version']}")
+
+def _precompute_in_background(dataset):
+    threading.Thread(
+        target=precompute_saved_views, args=(dataset,),
+        name="tuxconfig-views", daemon=True
+    ).start()
+
+add_dataset_listener(_precompute_in_background)